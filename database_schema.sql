@@ -1,14 +1,22 @@
 -- SAIV Database Schema
 -- Generated from DATABASE-SCHEMA.md
 
+-- =============================================================================
+-- EXTENSIONS
+-- =============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm; -- substring search on users
+
 -- =============================================================================
 -- ENUMS
 -- =============================================================================
 
 CREATE TYPE user_role AS ENUM ('student', 'instructor', 'ta', 'admin');
 CREATE TYPE session_status AS ENUM ('scheduled', 'active', 'closed', 'cancelled');
+CREATE TYPE session_type AS ENUM ('lecture', 'tutorial', 'lab', 'other');
 CREATE TYPE checkin_status AS ENUM ('pending', 'approved', 'flagged', 'rejected', 'appealed');
 CREATE TYPE risk_severity AS ENUM ('low', 'medium', 'high', 'critical');
+CREATE TYPE device_trust_score AS ENUM ('low', 'medium', 'high');
 CREATE TYPE risk_signal_type AS ENUM (
     'geo_out_of_bounds', 'impossible_travel', 'geo_accuracy_low',
     'vpn_detected', 'proxy_detected', 'tor_detected', 'suspicious_ip',
@@ -35,7 +43,7 @@ CREATE TYPE audit_action AS ENUM (
 
 -- 1. Users
 CREATE TABLE users (
-    id VARCHAR(36) PRIMARY KEY, -- UUID
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     email VARCHAR(255) UNIQUE NOT NULL,
     full_name VARCHAR(255) NOT NULL,
     hashed_password VARCHAR(255) NOT NULL,
@@ -51,56 +59,57 @@ CREATE TABLE users (
     scheduled_deletion_at TIMESTAMP
 );
 
-CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_role ON users(role);
 CREATE INDEX idx_users_is_active ON users(is_active);
+-- Trigram indexes back the admin user search (ILIKE '%term%' on name/email)
+CREATE INDEX idx_users_full_name_trgm ON users USING gin (full_name gin_trgm_ops);
+CREATE INDEX idx_users_email_trgm ON users USING gin (email gin_trgm_ops);
 
 -- 2. Courses
 CREATE TABLE courses (
-    id VARCHAR(36) PRIMARY KEY, -- UUID
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     code VARCHAR(20) UNIQUE NOT NULL,
     name VARCHAR(255) NOT NULL,
     description TEXT,
     semester VARCHAR(20) NOT NULL,
-    instructor_id VARCHAR(36) REFERENCES users(id) ON DELETE SET NULL,
+    instructor_id UUID REFERENCES users(id) ON DELETE SET NULL,
     is_active BOOLEAN NOT NULL DEFAULT TRUE,
     venue_latitude FLOAT,
     venue_longitude FLOAT,
     venue_name VARCHAR(255),
-    geofence_radius_meters FLOAT DEFAULT 100.0,
+    geofence_radius_meters FLOAT DEFAULT 100.0 CHECK (geofence_radius_meters > 0),
     require_face_recognition BOOLEAN DEFAULT FALSE,
     require_device_binding BOOLEAN DEFAULT TRUE,
-    risk_threshold FLOAT DEFAULT 0.5,
+    risk_threshold FLOAT DEFAULT 0.5 CHECK (risk_threshold BETWEEN 0 AND 1),
     created_at TIMESTAMP NOT NULL,
     updated_at TIMESTAMP NOT NULL
 );
 
-CREATE INDEX idx_courses_code ON courses(code);
 CREATE INDEX idx_courses_semester ON courses(semester);
 CREATE INDEX idx_courses_is_active ON courses(is_active);
 CREATE INDEX idx_courses_instructor_id ON courses(instructor_id);
 
 -- 3. Enrollments
 CREATE TABLE enrollments (
-    id VARCHAR(36) PRIMARY KEY, -- UUID
-    student_id VARCHAR(36) NOT NULL REFERENCES users(id),
-    course_id VARCHAR(36) NOT NULL REFERENCES courses(id),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    student_id UUID NOT NULL REFERENCES users(id),
+    course_id UUID NOT NULL REFERENCES courses(id),
     is_active BOOLEAN NOT NULL DEFAULT TRUE,
     enrolled_at TIMESTAMP NOT NULL,
     dropped_at TIMESTAMP,
     UNIQUE(student_id, course_id)
 );
 
-CREATE INDEX idx_enrollments_student_id ON enrollments(student_id);
+-- student_id lookups use the UNIQUE(student_id, course_id) index
 CREATE INDEX idx_enrollments_course_id ON enrollments(course_id);
 
 -- 4. Sessions
 CREATE TABLE sessions (
-    id VARCHAR(36) PRIMARY KEY, -- UUID
-    course_id VARCHAR(36) NOT NULL REFERENCES courses(id),
-    instructor_id VARCHAR(36) REFERENCES users(id),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    course_id UUID NOT NULL REFERENCES courses(id),
+    instructor_id UUID REFERENCES users(id),
     name VARCHAR(255) NOT NULL,
-    session_type VARCHAR(50) DEFAULT 'lecture',
+    session_type session_type DEFAULT 'lecture',
     description TEXT,
     scheduled_start TIMESTAMP NOT NULL,
     scheduled_end TIMESTAMP NOT NULL,
@@ -112,10 +121,10 @@ CREATE TABLE sessions (
     venue_latitude FLOAT,
     venue_longitude FLOAT,
     venue_name VARCHAR(255),
-    geofence_radius_meters FLOAT,
+    geofence_radius_meters FLOAT CHECK (geofence_radius_meters > 0),
     require_liveness_check BOOLEAN DEFAULT TRUE,
     require_face_match BOOLEAN DEFAULT FALSE,
-    risk_threshold FLOAT,
+    risk_threshold FLOAT CHECK (risk_threshold BETWEEN 0 AND 1),
     qr_code_secret VARCHAR(64),
     qr_code_expires_at TIMESTAMP,
     qr_code_enabled BOOLEAN DEFAULT FALSE,
@@ -131,8 +140,22 @@ CREATE INDEX idx_sessions_checkin_window ON sessions(checkin_opens_at, checkin_c
 
 -- 5. Devices
 CREATE TABLE devices (
-    id VARCHAR(36) PRIMARY KEY, -- UUID
-    user_id VARCHAR(36) NOT NULL REFERENCES users(id),
+    -- Columns are ordered fixed-width first (widest alignment first, booleans packed together) so rows carry no padding
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id),
+    public_key_created_at TIMESTAMP NOT NULL,
+    public_key_expires_at TIMESTAMP,
+    last_attestation_at TIMESTAMP,
+    first_seen_at TIMESTAMP NOT NULL,
+    last_seen_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP,
+    total_checkins INTEGER DEFAULT 0,
+    trust_score device_trust_score DEFAULT 'low',
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    is_trusted BOOLEAN DEFAULT FALSE,
+    attestation_passed BOOLEAN DEFAULT FALSE,
+    is_emulator BOOLEAN DEFAULT FALSE,
+    is_rooted_jailbroken BOOLEAN DEFAULT FALSE,
     device_fingerprint VARCHAR(64) UNIQUE NOT NULL,
     device_name VARCHAR(255),
     platform VARCHAR(50),
@@ -140,34 +163,21 @@ CREATE TABLE devices (
     os_version VARCHAR(50),
     app_version VARCHAR(50),
     public_key TEXT NOT NULL,
-    public_key_created_at TIMESTAMP NOT NULL,
-    public_key_expires_at TIMESTAMP,
-    attestation_passed BOOLEAN DEFAULT FALSE,
-    last_attestation_at TIMESTAMP,
     attestation_token TEXT,
-    is_trusted BOOLEAN DEFAULT FALSE,
-    trust_score VARCHAR(20) DEFAULT 'low',
-    is_emulator BOOLEAN DEFAULT FALSE,
-    is_rooted_jailbroken BOOLEAN DEFAULT FALSE,
-    first_seen_at TIMESTAMP NOT NULL,
-    last_seen_at TIMESTAMP NOT NULL,
-    total_checkins INTEGER DEFAULT 0,
-    is_active BOOLEAN NOT NULL DEFAULT TRUE,
-    revoked_at TIMESTAMP,
     revocation_reason TEXT
-);
+) WITH (fillfactor = 90); -- free space per page keeps the per-check-in trigger UPDATEs HOT
 
 CREATE INDEX idx_devices_user_id ON devices(user_id);
-CREATE INDEX idx_devices_fingerprint ON devices(device_fingerprint);
-CREATE INDEX idx_devices_is_active ON devices(is_active);
-CREATE INDEX idx_devices_is_trusted ON devices(is_trusted);
+-- Active-device lookups per user; is_active/is_trusted alone are too unselective to be worth indexing.
+-- last_seen_at stays unindexed so the check-in trigger's updates never touch an index.
+CREATE INDEX idx_devices_user_active ON devices(user_id) WHERE is_active;
 
 -- 6. CheckIns
 CREATE TABLE checkins (
-    id VARCHAR(36) PRIMARY KEY, -- UUID
-    session_id VARCHAR(36) NOT NULL REFERENCES sessions(id),
-    student_id VARCHAR(36) NOT NULL REFERENCES users(id),
-    device_id VARCHAR(36) REFERENCES devices(id),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    session_id UUID NOT NULL REFERENCES sessions(id),
+    student_id UUID NOT NULL REFERENCES users(id),
+    device_id UUID REFERENCES devices(id),
     status checkin_status NOT NULL,
     checked_in_at TIMESTAMP NOT NULL,
     verified_at TIMESTAMP,
@@ -176,15 +186,15 @@ CREATE TABLE checkins (
     location_accuracy_meters FLOAT,
     distance_from_venue_meters FLOAT,
     liveness_passed BOOLEAN,
-    liveness_score FLOAT,
+    liveness_score FLOAT CHECK (liveness_score BETWEEN 0 AND 1),
     liveness_challenge_type VARCHAR(50),
     face_match_passed BOOLEAN,
-    face_match_score FLOAT,
+    face_match_score FLOAT CHECK (face_match_score BETWEEN 0 AND 1),
     face_embedding_hash VARCHAR(64),
-    risk_score FLOAT NOT NULL DEFAULT 0.0,
-    risk_factors TEXT, -- JSON array
+    risk_score FLOAT NOT NULL DEFAULT 0.0 CHECK (risk_score BETWEEN 0 AND 1),
+    risk_factors JSONB, -- array of risk factor objects
     qr_code_verified BOOLEAN DEFAULT FALSE,
-    reviewed_by_id VARCHAR(36) REFERENCES users(id),
+    reviewed_by_id UUID REFERENCES users(id),
     reviewed_at TIMESTAMP,
     review_notes TEXT,
     appeal_reason TEXT,
@@ -193,46 +203,112 @@ CREATE TABLE checkins (
     UNIQUE(session_id, student_id)
 );
 
-CREATE INDEX idx_checkins_session_id ON checkins(session_id);
-CREATE INDEX idx_checkins_student_id ON checkins(student_id);
-CREATE INDEX idx_checkins_status ON checkins(status);
+-- Composite indexes for the hot paths; they also cover plain session_id / student_id lookups
+CREATE INDEX idx_checkins_session_status ON checkins(session_id, status, risk_score);
+CREATE INDEX idx_checkins_session_time ON checkins(session_id, checked_in_at);
+CREATE INDEX idx_checkins_student_time ON checkins(student_id, checked_in_at DESC) INCLUDE (status, risk_score, session_id);
+-- Review queue (flagged/appealed) is a small slice of all check-ins; approved rows are never looked up by status alone
+CREATE INDEX idx_checkins_needs_review ON checkins(session_id) WHERE status IN ('flagged', 'appealed');
 CREATE INDEX idx_checkins_checked_in_at ON checkins(checked_in_at);
+-- Admin/instructor check-in lists filter on a risk_score range without any session_id
 CREATE INDEX idx_checkins_risk_score ON checkins(risk_score);
 
+-- Keeps the device's check-in counter, last-seen time and trust score current as part of the check-in INSERT
+-- Trust score bands: risk < 0.3 low, < 0.7 medium, otherwise high
+CREATE OR REPLACE FUNCTION update_device_after_checkin() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE devices
+    SET total_checkins = COALESCE(total_checkins, 0) + 1,
+        last_seen_at = NEW.checked_in_at,
+        trust_score = CASE
+            WHEN NEW.risk_score < 0.3 THEN 'low'
+            WHEN NEW.risk_score < 0.7 THEN 'medium'
+            ELSE 'high'
+        END::device_trust_score
+    WHERE id = NEW.device_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_checkins_update_device
+AFTER INSERT ON checkins
+FOR EACH ROW EXECUTE FUNCTION update_device_after_checkin();
+
 -- 7. Risk Signals
 CREATE TABLE risk_signals (
-    id VARCHAR(36) PRIMARY KEY, -- UUID
-    checkin_id VARCHAR(36) NOT NULL REFERENCES checkins(id),
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    checkin_id UUID NOT NULL REFERENCES checkins(id),
     signal_type risk_signal_type NOT NULL,
     severity risk_severity NOT NULL,
     confidence FLOAT NOT NULL DEFAULT 1.0,
-    details TEXT, -- JSON metadata
+    details JSONB,
     weight FLOAT NOT NULL DEFAULT 0.1,
-    detected_at TIMESTAMP NOT NULL
+    detected_at TIMESTAMP NOT NULL DEFAULT timezone('UTC', clock_timestamp())
 );
 
 CREATE INDEX idx_risk_signals_checkin_id ON risk_signals(checkin_id);
-CREATE INDEX idx_risk_signals_type ON risk_signals(signal_type);
-CREATE INDEX idx_risk_signals_severity ON risk_signals(severity);
-CREATE INDEX idx_risk_signals_detected_at ON risk_signals(detected_at);
+-- Append-only and only ever range-scanned, so a block-range index is enough
+CREATE INDEX idx_risk_signals_detected_at ON risk_signals USING BRIN (detected_at) WITH (pages_per_range = 32);
 
--- 8. Audit Logs
+-- 8. Audit Logs (append-only, range-partitioned by month on timestamp)
 CREATE TABLE audit_logs (
-    id VARCHAR(36) PRIMARY KEY, -- UUID
-    user_id VARCHAR(36) REFERENCES users(id),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id UUID REFERENCES users(id),
     action audit_action NOT NULL,
     resource_type VARCHAR(50),
     resource_id VARCHAR(36),
     ip_address VARCHAR(45),
     user_agent VARCHAR(500),
-    device_id VARCHAR(36), -- No foreign key enforced to allow logs for deleted devices
-    details TEXT, -- JSON details
+    device_id UUID, -- No foreign key enforced to allow logs for deleted devices
+    details JSONB,
     success BOOLEAN DEFAULT TRUE,
-    timestamp TIMESTAMP NOT NULL
-);
+    timestamp TIMESTAMP NOT NULL DEFAULT timezone('UTC', clock_timestamp()), -- per row, not per transaction like now()
+    PRIMARY KEY (id, timestamp) -- partition key must be part of the primary key
+) PARTITION BY RANGE (timestamp);
+
+-- Catches rows outside the pre-created monthly partitions
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+-- Creates the monthly partition audit_logs_YYYY_MM containing month_start (UTC timestamps).
+-- Rows for that month may already sit in audit_logs_default (e.g. the backend was down over a month boundary);
+-- they would make a plain CREATE ... PARTITION OF fail, so they are moved into the new partition before it is attached.
+CREATE OR REPLACE FUNCTION create_audit_logs_partition(month_start DATE) RETURNS VOID AS $$
+DECLARE
+    range_start DATE := date_trunc('month', month_start)::DATE;
+    range_end DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'audit_logs_' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    -- Holds off inserts routed to the default partition until the new partition is attached
+    LOCK TABLE audit_logs_default IN ACCESS EXCLUSIVE MODE;
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN; -- created by a concurrent caller while this one waited for the lock
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM audit_logs_default WHERE timestamp >= %L AND timestamp < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        range_start, range_end, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, range_start, range_end
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Current and next month; the backend re-checks both on startup and daily (services/auditPartitionCron.ts)
+SELECT create_audit_logs_partition(timezone('UTC', now())::DATE);
+SELECT create_audit_logs_partition((timezone('UTC', now()) + INTERVAL '1 month')::DATE);
 
+-- Indexes on the partitioned parent are created on (and stay local to) every partition
 CREATE INDEX idx_audit_logs_user_id ON audit_logs(user_id);
 CREATE INDEX idx_audit_logs_action ON audit_logs(action);
 CREATE INDEX idx_audit_logs_timestamp ON audit_logs(timestamp);
 CREATE INDEX idx_audit_logs_resource ON audit_logs(resource_type, resource_id);
 CREATE INDEX idx_audit_logs_ip ON audit_logs(ip_address);
+CREATE INDEX idx_audit_logs_details ON audit_logs USING GIN (details jsonb_path_ops);
@@ -0,0 +1,89 @@
+-- Converts every id / foreign key column from VARCHAR(36) to native UUID on a database created
+-- from the VARCHAR(36) version of database_schema.sql. Fresh databases already get UUID columns.
+--
+-- Run once, offline (the backend stopped), before deploying the UUID-aware backend:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/001_native_uuid_ids.sql
+-- Every statement runs in one transaction: an id that is not a valid UUID aborts the cast and
+-- leaves the database untouched.
+
+BEGIN;
+
+-- Foreign keys must go first: both sides of a constraint have to change type together
+ALTER TABLE courses DROP CONSTRAINT courses_instructor_id_fkey;
+ALTER TABLE enrollments DROP CONSTRAINT enrollments_student_id_fkey;
+ALTER TABLE enrollments DROP CONSTRAINT enrollments_course_id_fkey;
+ALTER TABLE sessions DROP CONSTRAINT sessions_course_id_fkey;
+ALTER TABLE sessions DROP CONSTRAINT sessions_instructor_id_fkey;
+ALTER TABLE devices DROP CONSTRAINT devices_user_id_fkey;
+ALTER TABLE checkins DROP CONSTRAINT checkins_session_id_fkey;
+ALTER TABLE checkins DROP CONSTRAINT checkins_student_id_fkey;
+ALTER TABLE checkins DROP CONSTRAINT checkins_device_id_fkey;
+ALTER TABLE checkins DROP CONSTRAINT checkins_reviewed_by_id_fkey;
+ALTER TABLE risk_signals DROP CONSTRAINT risk_signals_checkin_id_fkey;
+ALTER TABLE audit_logs DROP CONSTRAINT audit_logs_user_id_fkey;
+
+ALTER TABLE users
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid();
+
+ALTER TABLE courses
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN instructor_id TYPE UUID USING instructor_id::uuid;
+
+ALTER TABLE enrollments
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN student_id TYPE UUID USING student_id::uuid,
+    ALTER COLUMN course_id TYPE UUID USING course_id::uuid;
+
+ALTER TABLE sessions
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN course_id TYPE UUID USING course_id::uuid,
+    ALTER COLUMN instructor_id TYPE UUID USING instructor_id::uuid;
+
+ALTER TABLE devices
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN user_id TYPE UUID USING user_id::uuid;
+
+ALTER TABLE checkins
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN session_id TYPE UUID USING session_id::uuid,
+    ALTER COLUMN student_id TYPE UUID USING student_id::uuid,
+    ALTER COLUMN device_id TYPE UUID USING device_id::uuid,
+    ALTER COLUMN reviewed_by_id TYPE UUID USING reviewed_by_id::uuid;
+
+ALTER TABLE risk_signals
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN checkin_id TYPE UUID USING checkin_id::uuid;
+
+-- audit_logs.device_id has no foreign key and used to receive ids truncated to 36 characters,
+-- so it may hold values that are not UUIDs; those become NULL instead of failing the migration.
+-- resource_id stays VARCHAR(36): it also holds emails and other non-id values.
+ALTER TABLE audit_logs
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN user_id TYPE UUID USING user_id::uuid,
+    ALTER COLUMN device_id TYPE UUID USING (
+        CASE WHEN device_id ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' THEN device_id::uuid END
+    );
+
+ALTER TABLE courses ADD CONSTRAINT courses_instructor_id_fkey
+    FOREIGN KEY (instructor_id) REFERENCES users(id) ON DELETE SET NULL;
+ALTER TABLE enrollments ADD CONSTRAINT enrollments_student_id_fkey FOREIGN KEY (student_id) REFERENCES users(id);
+ALTER TABLE enrollments ADD CONSTRAINT enrollments_course_id_fkey FOREIGN KEY (course_id) REFERENCES courses(id);
+ALTER TABLE sessions ADD CONSTRAINT sessions_course_id_fkey FOREIGN KEY (course_id) REFERENCES courses(id);
+ALTER TABLE sessions ADD CONSTRAINT sessions_instructor_id_fkey FOREIGN KEY (instructor_id) REFERENCES users(id);
+ALTER TABLE devices ADD CONSTRAINT devices_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(id);
+ALTER TABLE checkins ADD CONSTRAINT checkins_session_id_fkey FOREIGN KEY (session_id) REFERENCES sessions(id);
+ALTER TABLE checkins ADD CONSTRAINT checkins_student_id_fkey FOREIGN KEY (student_id) REFERENCES users(id);
+ALTER TABLE checkins ADD CONSTRAINT checkins_device_id_fkey FOREIGN KEY (device_id) REFERENCES devices(id);
+ALTER TABLE checkins ADD CONSTRAINT checkins_reviewed_by_id_fkey FOREIGN KEY (reviewed_by_id) REFERENCES users(id);
+ALTER TABLE risk_signals ADD CONSTRAINT risk_signals_checkin_id_fkey FOREIGN KEY (checkin_id) REFERENCES checkins(id);
+ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(id);
+
+COMMIT;
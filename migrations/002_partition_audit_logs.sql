@@ -0,0 +1,101 @@
+-- Converts an existing, unpartitioned audit_logs table into the monthly range-partitioned layout of
+-- database_schema.sql. Run after 001_native_uuid_ids.sql, once, with the backend stopped:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/002_partition_audit_logs.sql
+-- A table cannot be turned into a partitioned one in place, so the old table is renamed, the partitioned
+-- table is created under the original name, every row is copied across and the old table is dropped.
+-- Everything runs in one transaction; audit_logs is unavailable for writes until it commits.
+
+BEGIN;
+
+ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned;
+ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey;
+ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_user_id_fkey TO audit_logs_unpartitioned_user_id_fkey;
+-- Index names are schema-wide; the partitioned table recreates all of them below
+DROP INDEX IF EXISTS idx_audit_logs_user_id, idx_audit_logs_action, idx_audit_logs_timestamp,
+    idx_audit_logs_resource, idx_audit_logs_ip, idx_audit_logs_details;
+
+-- 8. Audit Logs, as in database_schema.sql
+CREATE TABLE audit_logs (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id UUID REFERENCES users(id),
+    action audit_action NOT NULL,
+    resource_type VARCHAR(50),
+    resource_id VARCHAR(36),
+    ip_address VARCHAR(45),
+    user_agent VARCHAR(500),
+    device_id UUID, -- No foreign key enforced to allow logs for deleted devices
+    details JSONB,
+    success BOOLEAN DEFAULT TRUE,
+    timestamp TIMESTAMP NOT NULL DEFAULT timezone('UTC', clock_timestamp()), -- per row, not per transaction like now()
+    PRIMARY KEY (id, timestamp) -- partition key must be part of the primary key
+) PARTITION BY RANGE (timestamp);
+
+-- Catches rows outside the pre-created monthly partitions
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+-- Creates the monthly partition audit_logs_YYYY_MM containing month_start (UTC timestamps).
+-- Rows for that month may already sit in audit_logs_default (e.g. the backend was down over a month boundary);
+-- they would make a plain CREATE ... PARTITION OF fail, so they are moved into the new partition before it is attached.
+CREATE OR REPLACE FUNCTION create_audit_logs_partition(month_start DATE) RETURNS VOID AS $$
+DECLARE
+    range_start DATE := date_trunc('month', month_start)::DATE;
+    range_end DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'audit_logs_' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    -- Holds off inserts routed to the default partition until the new partition is attached
+    LOCK TABLE audit_logs_default IN ACCESS EXCLUSIVE MODE;
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN; -- created by a concurrent caller while this one waited for the lock
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM audit_logs_default WHERE timestamp >= %L AND timestamp < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        range_start, range_end, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, range_start, range_end
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- One partition per month that has rows, plus the current and next month, so nothing lands in the default partition
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', LEAST(oldest, timezone('UTC', now()))),
+            date_trunc('month', timezone('UTC', now()) + INTERVAL '1 month'),
+            INTERVAL '1 month'
+        )::DATE
+        FROM (SELECT min(timestamp) AS oldest FROM audit_logs_unpartitioned) AS bounds
+    LOOP
+        PERFORM create_audit_logs_partition(month);
+    END LOOP;
+END;
+$$;
+
+-- details::text::jsonb accepts the column whether it is still TEXT (JSON strings) or already JSONB
+INSERT INTO audit_logs (id, user_id, action, resource_type, resource_id, ip_address, user_agent, device_id, details, success, timestamp)
+SELECT id, user_id, action, resource_type, resource_id, ip_address, user_agent, device_id, details::text::jsonb, success, timestamp
+FROM audit_logs_unpartitioned;
+
+-- Indexes on the partitioned parent are created on (and stay local to) every partition
+CREATE INDEX idx_audit_logs_user_id ON audit_logs(user_id);
+CREATE INDEX idx_audit_logs_action ON audit_logs(action);
+CREATE INDEX idx_audit_logs_timestamp ON audit_logs(timestamp);
+CREATE INDEX idx_audit_logs_resource ON audit_logs(resource_type, resource_id);
+CREATE INDEX idx_audit_logs_ip ON audit_logs(ip_address);
+CREATE INDEX idx_audit_logs_details ON audit_logs USING GIN (details jsonb_path_ops);
+
+DROP TABLE audit_logs_unpartitioned;
+
+COMMIT;
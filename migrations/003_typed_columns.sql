@@ -0,0 +1,29 @@
+-- Converts the columns database_schema.sql now declares with native types (enums, JSONB) on a database created
+-- from the VARCHAR/TEXT version of the schema. Run after 002_partition_audit_logs.sql (which already converts audit_logs.details),
+-- once, with the backend stopped:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/003_typed_columns.sql
+-- Everything runs in one transaction: a value that does not fit its new type aborts the cast and leaves the
+-- database untouched.
+
+BEGIN;
+
+-- Free-form VARCHAR values become enums; a value outside the enum aborts the cast.
+-- The old VARCHAR default cannot be cast along with the column, so it is dropped and set again afterwards.
+CREATE TYPE session_type AS ENUM ('lecture', 'tutorial', 'lab', 'other');
+ALTER TABLE sessions ALTER COLUMN session_type DROP DEFAULT;
+ALTER TABLE sessions ALTER COLUMN session_type TYPE session_type USING session_type::session_type;
+ALTER TABLE sessions ALTER COLUMN session_type SET DEFAULT 'lecture';
+
+CREATE TYPE device_trust_score AS ENUM ('low', 'medium', 'high');
+ALTER TABLE devices ALTER COLUMN trust_score DROP DEFAULT;
+ALTER TABLE devices ALTER COLUMN trust_score TYPE device_trust_score USING trust_score::device_trust_score;
+ALTER TABLE devices ALTER COLUMN trust_score SET DEFAULT 'low';
+
+-- JSON stored as TEXT becomes JSONB; empty strings were never valid JSON and become NULL
+ALTER TABLE checkins
+    ALTER COLUMN risk_factors TYPE JSONB USING NULLIF(risk_factors, '')::jsonb;
+
+ALTER TABLE risk_signals
+    ALTER COLUMN details TYPE JSONB USING NULLIF(details, '')::jsonb;
+
+COMMIT;
@@ -5,6 +5,7 @@ import { USER_ROLE_TYPES, UserModel } from "../model/user.js";
 import { SESSION_STATUS, SessionModel } from '../model/session.js';
 import { EnrollmentModel } from '../model/enrollment.js';
 import { invalidateCachePattern } from '../helpers/cacheHelper.js';
+import { BULK_USER_CREATE_RESPONSE_SCHEMA } from '../schemas/user.js';
 
 async function invalidateStats(redis: any): Promise<void> {
     await invalidateCachePattern(redis, 'stats:overview*');
@@ -23,7 +24,7 @@ async function adminController(fastify: FastifyInstance) {
                 type: 'object',
                 required: ['user_id'],
                 properties: {
-                    user_id: { type: 'string' }
+                    user_id: { type: 'string', format: 'uuid' }
                 }
             }
         }
@@ -47,7 +48,7 @@ async function adminController(fastify: FastifyInstance) {
                 type: 'object',
                 required: ['user_id'],
                 properties: {
-                    user_id: { type: 'string' }
+                    user_id: { type: 'string', format: 'uuid' }
                 }
             }
         }
@@ -80,7 +81,7 @@ async function adminController(fastify: FastifyInstance) {
                             required: ['email', 'password', 'full_name', 'role'],
                             properties: {
                                 email: { type: 'string', format: 'email' },
-                                password: { type: 'string', minLength: 8 },
+                                password: { type: 'string', minLength: 8, maxLength: 128 },
                                 full_name: { type: 'string', minLength: 2 },
                                 role: {
                                     type: 'string',
@@ -95,7 +96,8 @@ async function adminController(fastify: FastifyInstance) {
                         }
                     }
                 }
-            }
+            },
+            response: { 201: BULK_USER_CREATE_RESPONSE_SCHEMA }
         }
     }, async (req: FastifyRequest, res: FastifyReply) => {
         const prisma = fastify.prisma
@@ -103,7 +105,8 @@ async function adminController(fastify: FastifyInstance) {
 
         const createdUsers = await UserModel.createMultipleUsers(prisma, users);
 
-        const error = users.filter((u: any) => !createdUsers.some((cu: any) => cu.email === u.email)).map((u: any) => {
+        const createdEmails = new Set(createdUsers.map(cu => cu.email));
+        const error = users.filter((u: any) => !createdEmails.has(u.email)).map((u: any) => {
             return { email: u.email, reason: 'User creation failed (possibly due to duplicate email)' };
         });
 
@@ -120,7 +123,7 @@ async function adminController(fastify: FastifyInstance) {
             params: {
                 type: 'object',
                 required: ['session_id'],
-                properties: { session_id: { type: 'string' } }
+                properties: { session_id: { type: 'string', format: 'uuid' } }
             },
             body: {
                 type: 'object',
@@ -151,8 +154,8 @@ async function adminController(fastify: FastifyInstance) {
                 type: 'object',
                 required: ['student_id', 'course_id'],
                 properties: {
-                    student_id: { type: 'string' },
-                    course_id: { type: 'string' }
+                    student_id: { type: 'string', format: 'uuid' },
+                    course_id: { type: 'string', format: 'uuid' }
                 }
             }
         },
@@ -12,7 +12,7 @@ async function auditController(fastify: FastifyInstance) {
             querystring: {
                 type: 'object',
                 properties: {
-                    user_id: { type: 'string' },
+                    user_id: { type: 'string', format: 'uuid' },
                     action: { type: 'string' },
                     resource_type: { type: 'string' },
                     resource_id: { type: 'string' },
@@ -7,6 +7,7 @@ import { UnauthorizedError } from '../model/error.js';
 import { AUDIT_ACTIONS, AuditModel } from '../model/audit.js';
 import { loginTotal, registrationTotal } from '../services/metrics.js';
 import { sendPasswordResetEmail } from '../services/mail.js';
+import { TOKEN_RESPONSE_SCHEMA, USER_DETAIL_RESPONSE_SCHEMA } from '../schemas/user.js';
 
 async function authController(fastify: FastifyInstance) {
     const uri = `${BASE_URL}/auth`;
@@ -26,7 +27,8 @@ async function authController(fastify: FastifyInstance) {
                     },
                     password: {
                         type: 'string',
-                        minLength: 8
+                        minLength: 8,
+                        maxLength: 128
                     },
                     full_name: {
                         type: 'string',
@@ -45,7 +47,8 @@ async function authController(fastify: FastifyInstance) {
                 },
                 required: ['email', 'password', 'full_name'],
                 additionalProperties: false
-            }
+            },
+            response: { 201: USER_DETAIL_RESPONSE_SCHEMA }
         },
         preHandler: [fastify.rateLimit({
             limit: 10,
@@ -72,14 +75,7 @@ async function authController(fastify: FastifyInstance) {
         });
         registrationTotal.inc({ role: user.role });
 
-        res.status(201).send({
-            id: user.id,
-            email: user.email,
-            full_name: user.full_name,
-            role: user.role,
-            is_active: user.is_active,
-            created_at: user.created_at
-        });
+        res.status(201).send(user);
     });
 
     fastify.post(`${uri}/login`, {
@@ -89,15 +85,20 @@ async function authController(fastify: FastifyInstance) {
                 properties: {
                     email: {
                         type: 'string',
-                        format: 'email',
+                        // Login only needs a cheap shape check; full format validation happens at registration
+                        maxLength: 254,
                         pattern: '^[^\\s@]+@[^\\s@]+\\.[^\\s@]+$'
                     },
                     password: {
-                        type: 'string'
+                        type: 'string',
+                        // Accounts created before the 128-character cap on new passwords must still be able to log in;
+                        // this only bounds the bcrypt input
+                        maxLength: 1024
                     }
                 },
                 required: ['email', 'password']
-            }
+            },
+            response: { 200: TOKEN_RESPONSE_SCHEMA }
         },
         preHandler: [fastify.rateLimit({
             limit: 60,
@@ -206,7 +207,8 @@ async function authController(fastify: FastifyInstance) {
                 properties: {
                     refresh_token: { type: 'string' }
                 }
-            }
+            },
+            response: { 200: TOKEN_RESPONSE_SCHEMA }
         },
         preHandler: [fastify.rateLimit()]
     }, async (req: FastifyRequest, res: FastifyReply) => {
@@ -324,7 +326,7 @@ async function authController(fastify: FastifyInstance) {
                 type: 'object',
                 properties: {
                     token: { type: 'string', minLength: 16 },
-                    password: { type: 'string', minLength: 8 }
+                    password: { type: 'string', minLength: 8, maxLength: 128 }
                 },
                 required: ['token', 'password'],
                 additionalProperties: false
@@ -242,9 +242,9 @@ async function checkinController(fastify: FastifyInstance) {
             querystring: {
                 type: 'object',
                 properties: {
-                    session_id: { type: 'string' },
-                    course_id: { type: 'string' },
-                    student_id: { type: 'string' },
+                    session_id: { type: 'string', format: 'uuid' },
+                    course_id: { type: 'string', format: 'uuid' },
+                    student_id: { type: 'string', format: 'uuid' },
                     status: {
                         type: 'string',
                         enum: Object.values(CHECKIN_STATUS)
@@ -279,7 +279,7 @@ async function checkinController(fastify: FastifyInstance) {
             querystring: {
                 type: 'object',
                 properties: {
-                    course_id: { type: 'string' },
+                    course_id: { type: 'string', format: 'uuid' },
                     limit: { type: 'integer', minimum: 1, maximum: 200, default: 50 }
                 }
             }
@@ -310,7 +310,7 @@ async function checkinController(fastify: FastifyInstance) {
                 type: 'object',
                 required: ['sessionId'],
                 properties: {
-                    sessionId: { type: 'string' }
+                    sessionId: { type: 'string', format: 'uuid' }
                 }
             }
         },
@@ -343,8 +343,8 @@ async function checkinController(fastify: FastifyInstance) {
             querystring: {
                 type: 'object',
                 properties: {
-                    course_id: { type: 'string' },
-                    session_id: { type: 'string' },
+                    course_id: { type: 'string', format: 'uuid' },
+                    session_id: { type: 'string', format: 'uuid' },
                     limit: { type: 'integer', minimum: 1, maximum: 200, default: 20 },
                     offset: { type: 'integer', minimum: 0, default: 0 }
                 }
@@ -392,7 +392,7 @@ async function checkinController(fastify: FastifyInstance) {
                 type: 'object',
                 required: ['checkin_id'],
                 properties: {
-                    checkin_id: { type: 'string' }
+                    checkin_id: { type: 'string', format: 'uuid' }
                 }
             }
         }
@@ -413,7 +413,7 @@ async function checkinController(fastify: FastifyInstance) {
                 type: 'object',
                 required: ['id'],
                 properties: {
-                    id: { type: 'string' }
+                    id: { type: 'string', format: 'uuid' }
                 }
             },
             body: {
@@ -463,7 +463,7 @@ async function checkinController(fastify: FastifyInstance) {
                 type: 'object',
                 required: ['id'],
                 properties: {
-                    id: { type: 'string' }
+                    id: { type: 'string', format: 'uuid' }
                 }
             },
             body: {
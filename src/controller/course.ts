@@ -21,7 +21,7 @@ async function courseController(fastify: any) {
                 properties: {
                     is_active: { type: 'boolean' },
                     semester: { type: 'string' },
-                    instructor_id: { type: 'string' },
+                    instructor_id: { type: 'string', format: 'uuid' },
                     limit: { type: 'integer', default: 50 },
                     offset: { type: 'integer', default: 0 }
                 }
@@ -48,7 +48,7 @@ async function courseController(fastify: any) {
             params: {
                 type: 'object',
                 required: ['course_id'],
-                properties: { course_id: { type: 'string' } }
+                properties: { course_id: { type: 'string', format: 'uuid' } }
             }
         }, preHandler: [fastify.authorize(), fastify.rateLimit()]
     }, async (req: FastifyRequest, res: FastifyReply) => {
@@ -70,12 +70,12 @@ async function courseController(fastify: any) {
                     venue_name: { type: 'string' },
                     venue_latitude: { type: 'number' },
                     venue_longitude: { type: 'number' },
-                    geofence_radius_meters: { type: 'number', default: 100.0 },
+                    geofence_radius_meters: { type: 'number', exclusiveMinimum: 0, default: 100.0 },
                     require_face_recognition: { type: 'boolean', default: false },
                     require_device_binding: { type: 'boolean', default: true },
-                    risk_threshold: { type: 'number', default: 0.5 },
+                    risk_threshold: { type: 'number', minimum: 0, maximum: 1, default: 0.5 },
                     is_active: { type: 'boolean' },
-                    instructor_id: { type: 'string' }
+                    instructor_id: { type: 'string', format: 'uuid' }
                 },
                 required: ['code', 'name', 'semester'],
             }
@@ -92,7 +92,7 @@ async function courseController(fastify: any) {
             params: {
                 type: 'object',
                 required: ['course_id'],
-                properties: { course_id: { type: 'string' } }
+                properties: { course_id: { type: 'string', format: 'uuid' } }
             },
             body: {
                 type: 'object',
@@ -102,12 +102,12 @@ async function courseController(fastify: any) {
                     venue_name: { type: 'string' },
                     venue_latitude: { type: 'number' },
                     venue_longitude: { type: 'number' },
-                    geofence_radius_meters: { type: 'number' },
+                    geofence_radius_meters: { type: 'number', exclusiveMinimum: 0 },
                     require_face_recognition: { type: 'boolean' },
                     require_device_binding: { type: 'boolean' },
-                    risk_threshold: { type: 'number' },
+                    risk_threshold: { type: 'number', minimum: 0, maximum: 1 },
                     is_active: { type: 'boolean' },
-                    instructor_id: { type: 'string' }
+                    instructor_id: { type: 'string', format: 'uuid' }
                 }
             }
         }, preHandler: [fastify.authorize([USER_ROLE_TYPES.ADMIN, USER_ROLE_TYPES.INSTRUCTOR]), fastify.rateLimit()]
@@ -124,7 +124,7 @@ async function courseController(fastify: any) {
             params: {
                 type: 'object',
                 required: ['course_id'],
-                properties: { course_id: { type: 'string' } }
+                properties: { course_id: { type: 'string', format: 'uuid' } }
             },
         }, preHandler: [fastify.authorize([USER_ROLE_TYPES.ADMIN]), fastify.rateLimit()]
     }, async (req: FastifyRequest, res: FastifyReply) => {
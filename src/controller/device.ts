@@ -16,7 +16,7 @@ async function deviceController(fastify: FastifyInstance) {
             querystring: {
                 type: 'object',
                 properties: {
-                    user_id: { type: 'string' },
+                    user_id: { type: 'string', format: 'uuid' },
                     is_active: { type: 'boolean' },
                     limit: { type: 'integer', minimum: 1, maximum: 200, default: 50 },
                     offset: { type: 'integer', minimum: 0, default: 0 }
@@ -165,6 +165,11 @@ async function deviceController(fastify: FastifyInstance) {
     fastify.patch(`${uri}/:device_id`, {
         preHandler: [fastify.authorize(), fastify.rateLimit()],
         schema: {
+            params: {
+                type: 'object',
+                required: ['device_id'],
+                properties: { device_id: { type: 'string', format: 'uuid' } }
+            },
             body: {
                 type: 'object',
                 properties: {
@@ -215,7 +220,7 @@ async function deviceController(fastify: FastifyInstance) {
             params: {
                 type: 'object',
                 required: ['device_id'],
-                properties: { device_id: { type: 'string' } }
+                properties: { device_id: { type: 'string', format: 'uuid' } }
             }
         },
         preHandler: [fastify.authorize(), fastify.rateLimit()]
@@ -39,7 +39,7 @@ function enrollmentController(fastify: FastifyInstance) {
                 params: {
                     type: "object",
                     properties: {
-                        courseId: { type: "string" }
+                        courseId: { type: "string", format: "uuid" }
                     },
                     required: ["courseId"]
                 },
@@ -81,8 +81,8 @@ function enrollmentController(fastify: FastifyInstance) {
             body: {
                 type: "object",
                 properties: {
-                    student_id: { type: "string" },
-                    course_id: { type: "string" }
+                    student_id: { type: "string", format: "uuid" },
+                    course_id: { type: "string", format: "uuid" }
                 },
                 required: ["student_id", "course_id"]
             }
@@ -123,7 +123,7 @@ function enrollmentController(fastify: FastifyInstance) {
                 type: 'object',
                 required: ['course_id', 'student_emails'],
                 properties: {
-                    course_id: { type: 'string' },
+                    course_id: { type: 'string', format: 'uuid' },
                     student_emails: {
                         type: 'array',
                         items: { type: 'string', format: 'email' },
@@ -156,7 +156,7 @@ function enrollmentController(fastify: FastifyInstance) {
             params: {
                 type: 'object',
                 properties: {
-                    enrollment_id: { type: 'string' }
+                    enrollment_id: { type: 'string', format: 'uuid' }
                 },
                 required: ['enrollment_id']
             }
@@ -44,7 +44,7 @@ async function exportController(fastify: FastifyInstance) {
             params: {
                 type: 'object',
                 required: ['courseId'],
-                properties: { courseId: { type: 'string' } }
+                properties: { courseId: { type: 'string', format: 'uuid' } }
             },
             querystring: {
                 type: 'object',
@@ -126,7 +126,7 @@ async function exportController(fastify: FastifyInstance) {
             params: {
                 type: 'object',
                 required: ['sessionId'],
-                properties: { sessionId: { type: 'string' } }
+                properties: { sessionId: { type: 'string', format: 'uuid' } }
             },
             querystring: {
                 type: 'object',
@@ -17,8 +17,8 @@ async function sessionController(fastify: any) {
                 type: 'object',
                 properties: {
                     status: { type: 'string', enum: Object.values(SESSION_STATUS) },
-                    course_id: { type: 'string' },
-                    instructor_id: { type: 'string' },
+                    course_id: { type: 'string', format: 'uuid' },
+                    instructor_id: { type: 'string', format: 'uuid' },
                     start_date: { type: 'string', format: 'date-time' },
                     end_date: { type: 'string', format: 'date-time' },
                     limit: { type: 'integer', default: 50 },
@@ -96,7 +96,7 @@ async function sessionController(fastify: any) {
             params: {
                 type: 'object',
                 required: ['session_id'],
-                properties: { session_id: { type: 'string' } }
+                properties: { session_id: { type: 'string', format: 'uuid' } }
             }
         }, preHandler: [fastify.authorize(), fastify.rateLimit()]
     }, async (req: FastifyRequest, res: FastifyReply) => {
@@ -112,8 +112,8 @@ async function sessionController(fastify: any) {
                 type: 'object',
                 required: ['course_id', 'name', 'scheduled_start', 'scheduled_end'],
                 properties: {
-                    course_id: { type: 'string' },
-                    instructor_id: { type: 'string' },
+                    course_id: { type: 'string', format: 'uuid' },
+                    instructor_id: { type: 'string', format: 'uuid' },
                     name: { type: 'string' },
                     session_type: { type: 'string', enum: Object.values(SESSION_TYPE), default: 'lecture' },
                     description: { type: 'string' },
@@ -124,10 +124,10 @@ async function sessionController(fastify: any) {
                     venue_name: { type: 'string' },
                     venue_latitude: { type: 'number' },
                     venue_longitude: { type: 'number' },
-                    geofence_radius_meters: { type: 'number' },
+                    geofence_radius_meters: { type: 'number', exclusiveMinimum: 0 },
                     require_liveness_check: { type: 'boolean', default: true },
                     require_face_match: { type: 'boolean', default: false },
-                    risk_threshold: { type: 'number' },
+                    risk_threshold: { type: 'number', minimum: 0, maximum: 1 },
                     qr_code_enabled: { type: 'boolean', default: false }
                 }
             }
@@ -177,7 +177,7 @@ async function sessionController(fastify: any) {
             params: {
                 type: 'object',
                 required: ['session_id'],
-                properties: { session_id: { type: 'string' } }
+                properties: { session_id: { type: 'string', format: 'uuid' } }
             },
             body: {
                 type: 'object',
@@ -192,10 +192,10 @@ async function sessionController(fastify: any) {
                     venue_name: { type: 'string' },
                     venue_latitude: { type: 'number' },
                     venue_longitude: { type: 'number' },
-                    geofence_radius_meters: { type: 'number' },
+                    geofence_radius_meters: { type: 'number', exclusiveMinimum: 0 },
                     require_liveness_check: { type: 'boolean' },
                     require_face_match: { type: 'boolean' },
-                    risk_threshold: { type: 'number' },
+                    risk_threshold: { type: 'number', minimum: 0, maximum: 1 },
                     qr_code_enabled: { type: 'boolean' }
                 }
             }
@@ -230,7 +230,7 @@ async function sessionController(fastify: any) {
             params: {
                 type: 'object',
                 required: ['session_id'],
-                properties: { session_id: { type: 'string' } }
+                properties: { session_id: { type: 'string', format: 'uuid' } }
             }
         }, preHandler: [fastify.authorize([USER_ROLE_TYPES.TA, USER_ROLE_TYPES.INSTRUCTOR, USER_ROLE_TYPES.ADMIN]), fastify.rateLimit()]
     }, async (req: FastifyRequest, res: FastifyReply) => {
@@ -264,7 +264,7 @@ async function sessionController(fastify: any) {
                 type: 'object',
                 required: ['id'],
                 properties: {
-                    id: { type: 'string' }
+                    id: { type: 'string', format: 'uuid' }
                 }
             }
         },
@@ -3,7 +3,10 @@ import type { FastifyInstance, FastifyReply, FastifyRequest } from 'fastify';
 import { BASE_URL } from '../helpers/constants.js';
 import { StatsModel } from '../model/stats.js';
 import { USER_ROLE_TYPES } from '../model/user.js';
-import { getCache, setCache, generateStatsCacheKey } from '../helpers/cacheHelper.js';
+import { getCacheRaw, setCacheRaw, generateStatsCacheKey } from '../helpers/cacheHelper.js';
+
+// Stats payloads are serialized once and cached as JSON text, so cache hits skip parse + re-stringify
+const JSON_CONTENT_TYPE = 'application/json; charset=utf-8';
 
 async function statsController(fastify: FastifyInstance) {
 
@@ -14,7 +17,7 @@ async function statsController(fastify: FastifyInstance) {
                 type: 'object',
                 properties: {
                     days: { type: 'integer', minimum: 1, maximum: 365, default: 7 },
-                    course_id: { type: 'string' }
+                    course_id: { type: 'string', format: 'uuid' }
                 }
             }
         },
@@ -25,17 +28,17 @@ async function statsController(fastify: FastifyInstance) {
         const cacheKey = generateStatsCacheKey('overview', undefined, { days, ...(course_id && { course_id }) });
 
         // Try to get from cache
-        let data = await getCache(fastify.redis, cacheKey);
+        let payload = await getCacheRaw(fastify.redis, cacheKey);
 
-        if (!data) {
+        if (!payload) {
             if (course_id !== undefined) {
                 overviewParams.course_id = course_id;
             }
-            data = await StatsModel.getOverview(fastify.prisma, req.user as any, overviewParams);
+            payload = JSON.stringify(await StatsModel.getOverview(fastify.prisma, req.user as any, overviewParams));
             // Cache for 5 minutes
-            await setCache(fastify.redis, cacheKey, data, 300);
+            await setCacheRaw(fastify.redis, cacheKey, payload, 300);
         }
-        res.status(200).send(data);
+        res.status(200).type(JSON_CONTENT_TYPE).send(payload);
     });
 
     // GET /api/v1/stats/sessions/:sessionId
@@ -44,7 +47,7 @@ async function statsController(fastify: FastifyInstance) {
             params: {
                 type: 'object',
                 required: ['sessionId'],
-                properties: { sessionId: { type: 'string' } }
+                properties: { sessionId: { type: 'string', format: 'uuid' } }
             }
         },
         preHandler: [fastify.authorize([USER_ROLE_TYPES.INSTRUCTOR, USER_ROLE_TYPES.TA, USER_ROLE_TYPES.ADMIN]), fastify.rateLimit()]
@@ -53,14 +56,14 @@ async function statsController(fastify: FastifyInstance) {
         const cacheKey = generateStatsCacheKey('session', sessionId);
 
         // Try to get from cache
-        let data = await getCache(fastify.redis, cacheKey);
+        let payload = await getCacheRaw(fastify.redis, cacheKey);
 
-        if (!data) {
-            data = await StatsModel.getSessionStatsById(fastify.prisma, req.user as any, sessionId);
+        if (!payload) {
+            payload = JSON.stringify(await StatsModel.getSessionStatsById(fastify.prisma, req.user as any, sessionId));
             // Cache for 5 minutes
-            await setCache(fastify.redis, cacheKey, data, 300);
+            await setCacheRaw(fastify.redis, cacheKey, payload, 300);
         }
-        res.status(200).send(data);
+        res.status(200).type(JSON_CONTENT_TYPE).send(payload);
     });
 
     fastify.get(`${BASE_URL}/stats/courses/:courseId`, {
@@ -68,7 +71,7 @@ async function statsController(fastify: FastifyInstance) {
             params: {
                 type: 'object',
                 required: ['courseId'],
-                properties: { courseId: { type: 'string' } }
+                properties: { courseId: { type: 'string', format: 'uuid' } }
             },
             querystring: {
                 type: 'object',
@@ -86,9 +89,9 @@ async function statsController(fastify: FastifyInstance) {
         const cacheKey = generateStatsCacheKey('course', courseId, { ...(start_date && { start_date }), ...(end_date && { end_date }) });
 
         // Try to get from cache
-        let data = await getCache(fastify.redis, cacheKey);
+        let payload = await getCacheRaw(fastify.redis, cacheKey);
 
-        if (!data) {
+        if (!payload) {
             const rangeQuery: { start_date?: string; end_date?: string } = {};
             if (start_date !== undefined) {
                 rangeQuery.start_date = start_date;
@@ -96,11 +99,11 @@ async function statsController(fastify: FastifyInstance) {
             if (end_date !== undefined) {
                 rangeQuery.end_date = end_date;
             }
-            data = await StatsModel.getCourseStatsById(fastify.prisma, req.user as any, courseId, rangeQuery);
+            payload = JSON.stringify(await StatsModel.getCourseStatsById(fastify.prisma, req.user as any, courseId, rangeQuery));
             // Cache for 5 minutes
-            await setCache(fastify.redis, cacheKey, data, 300);
+            await setCacheRaw(fastify.redis, cacheKey, payload, 300);
         }
-        res.status(200).send(data);
+        res.status(200).type(JSON_CONTENT_TYPE).send(payload);
     });
 
     fastify.get(`${BASE_URL}/stats/students/:studentId`, {
@@ -108,7 +111,7 @@ async function statsController(fastify: FastifyInstance) {
             params: {
                 type: 'object',
                 required: ['studentId'],
-                properties: { studentId: { type: 'string' } }
+                properties: { studentId: { type: 'string', format: 'uuid' } }
             }
         },
         preHandler: [fastify.authorize([USER_ROLE_TYPES.INSTRUCTOR, USER_ROLE_TYPES.ADMIN]), fastify.rateLimit()]
@@ -117,14 +120,14 @@ async function statsController(fastify: FastifyInstance) {
         const cacheKey = generateStatsCacheKey('student', studentId);
 
         // Try to get from cache
-        let data = await getCache(fastify.redis, cacheKey);
+        let payload = await getCacheRaw(fastify.redis, cacheKey);
 
-        if (!data) {
-            data = await StatsModel.getStudentStatsById(fastify.prisma, req.user as any, studentId);
+        if (!payload) {
+            payload = JSON.stringify(await StatsModel.getStudentStatsById(fastify.prisma, req.user as any, studentId));
             // Cache for 5 minutes
-            await setCache(fastify.redis, cacheKey, data, 300);
+            await setCacheRaw(fastify.redis, cacheKey, payload, 300);
         }
-        res.status(200).send(data);
+        res.status(200).type(JSON_CONTENT_TYPE).send(payload);
     });
 }
 
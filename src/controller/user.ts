@@ -4,6 +4,7 @@ import { BASE_URL } from "../helpers/constants.js";
 import { ForbiddenError, NotFoundError, UnauthorizedError } from "../model/error.js";
 import { AUDIT_ACTIONS, AuditModel } from "../model/audit.js";
 import { USER_ROLE_TYPES, UserModel } from "../model/user.js";
+import { USER_DETAIL_RESPONSE_SCHEMA, USER_LIST_RESPONSE_SCHEMA, USER_RESPONSE_SCHEMA } from "../schemas/user.js";
 
 async function userController(fastify: FastifyInstance) {
     const uri = `${BASE_URL}/users`;
@@ -21,7 +22,8 @@ async function userController(fastify: FastifyInstance) {
                         limit: { type: "integer", minimum: 1, maximum: 100, default: 50 },
                         offset: { type: "integer", minimum: 0, default: 0 }
                     }
-                }
+                },
+                response: { 200: USER_LIST_RESPONSE_SCHEMA }
             },
             preHandler: [fastify.authorize([USER_ROLE_TYPES.ADMIN]), fastify.rateLimit()]
         },
@@ -31,22 +33,18 @@ async function userController(fastify: FastifyInstance) {
             res.status(200).send(data);
         });
 
-    fastify.get(`${uri}/me`, { preHandler: [fastify.authorize(), fastify.rateLimit()] }, async (req: FastifyRequest, res: FastifyReply) => {
+    fastify.get(`${uri}/me`, {
+        schema: {
+            response: { 200: USER_RESPONSE_SCHEMA }
+        },
+        preHandler: [fastify.authorize(), fastify.rateLimit()]
+    }, async (req: FastifyRequest, res: FastifyReply) => {
         const prisma = fastify.prisma;
         const user = await UserModel.getById(prisma, (req?.user as any)?.sub);
         if (!user.is_active) {
             throw new ForbiddenError("Account disabled");
         }
-        res.status(200).send({
-            id: user.id,
-            email: user.email,
-            full_name: user.full_name,
-            role: user.role,
-            camera_consent: user.camera_consent,
-            geolocation_consent: user.geolocation_consent,
-            face_enrolled: user.face_enrolled,
-            created_at: user.created_at
-        });
+        res.status(200).send(user);
     });
 
     fastify.put(`${uri}/me`, {
@@ -57,8 +55,12 @@ async function userController(fastify: FastifyInstance) {
                     full_name: { type: "string" },
                     camera_consent: { type: "boolean" },
                     geolocation_consent: { type: "boolean" }
-                }
-            }
+                },
+                // Partial update: only the keys present are validated and written
+                minProperties: 1,
+                additionalProperties: false
+            },
+            response: { 200: USER_RESPONSE_SCHEMA }
         },
         preHandler: [fastify.authorize(), fastify.rateLimit()]
     }, async (req: FastifyRequest, res: FastifyReply) => {
@@ -77,16 +79,7 @@ async function userController(fastify: FastifyInstance) {
             details: { updated_fields: Object.keys(req.body as any) }
         });
 
-        res.status(200).send({
-            id: updatedUser.id,
-            email: updatedUser.email,
-            full_name: updatedUser.full_name,
-            role: updatedUser.role,
-            camera_consent: updatedUser.camera_consent,
-            geolocation_consent: updatedUser.geolocation_consent,
-            face_enrolled: updatedUser.face_enrolled,
-            created_at: updatedUser.created_at
-        });
+        res.status(200).send(updatedUser);
     });
 
     fastify.get(`${uri}/:user_id`, {
@@ -97,7 +90,8 @@ async function userController(fastify: FastifyInstance) {
                     user_id: { type: "string", format: 'uuid' }
                 },
                 required: ["user_id"]
-            }
+            },
+            response: { 200: USER_DETAIL_RESPONSE_SCHEMA }
         },
         preHandler: [fastify.authorize([USER_ROLE_TYPES.ADMIN, USER_ROLE_TYPES.INSTRUCTOR]), fastify.rateLimit()]
     },
@@ -119,17 +113,7 @@ async function userController(fastify: FastifyInstance) {
                 throw new UnauthorizedError();
             }
 
-            res.status(200).send({
-                id: user!.id,
-                email: user!.email,
-                full_name: user!.full_name,
-                role: user!.role,
-                is_active: user!.is_active,
-                camera_consent: user!.camera_consent,
-                geolocation_consent: user!.geolocation_consent,
-                face_enrolled: user!.face_enrolled,
-                created_at: user!.created_at
-            });
+            res.status(200).send(user);
         });
 
     fastify.patch(`${uri}/:user_id`, {
@@ -147,7 +131,8 @@ async function userController(fastify: FastifyInstance) {
                     is_active: { type: "boolean" },
                     role: { type: "string", enum: Object.values(USER_ROLE_TYPES) }
                 }
-            }
+            },
+            response: { 200: USER_RESPONSE_SCHEMA }
         },
         preHandler: [fastify.authorize([USER_ROLE_TYPES.ADMIN]), fastify.rateLimit()]
     }, async (req: FastifyRequest, res: FastifyReply) => {
@@ -171,16 +156,7 @@ async function userController(fastify: FastifyInstance) {
         }
         const user = await UserModel.patchUserById(prisma, user_id, req.body as any);
 
-        res.status(200).send({
-            id: user.id,
-            email: user.email,
-            full_name: user.full_name,
-            role: user.role,
-            camera_consent: user.camera_consent,
-            geolocation_consent: user.geolocation_consent,
-            face_enrolled: user.face_enrolled,
-            created_at: user.created_at
-        });
+        res.status(200).send(user);
     });
 
     fastify.post(`${uri}/me/face/enroll`, {
@@ -189,7 +165,8 @@ async function userController(fastify: FastifyInstance) {
             body: {
                 type: 'object',
                 properties: {
-                    image: { type: 'string', minLength: 1 } // base64-encoded image string
+                    // base64-encoded image string; emptiness/charset are checked once by isBase64 in the model
+                    image: { type: 'string' }
                 },
                 required: ['image'],
                 additionalProperties: false
@@ -4,15 +4,11 @@ export interface CacheOptions {
 }
 
 /**
- * Get value from Redis cache
+ * Get the raw JSON string stored under a key, without parsing it
  */
-export async function getCache(redis: any, key: string): Promise<any | null> {
+export async function getCacheRaw(redis: any, key: string): Promise<string | null> {
     try {
-        const cached = await redis.get(key);
-        if (cached) {
-            return JSON.parse(cached);
-        }
-        return null;
+        return (await redis.get(key)) || null;
     } catch (err) {
         console.error(`Cache get error for key ${key}:`, err);
         return null;
@@ -20,16 +16,16 @@ export async function getCache(redis: any, key: string): Promise<any | null> {
 }
 
 /**
- * Set value in Redis cache with TTL
+ * Set an already-serialized JSON string in Redis cache with TTL
  */
-export async function setCache(
+export async function setCacheRaw(
     redis: any,
     key: string,
-    value: any,
+    payload: string,
     ttl: number = 300 // Default 5 minutes
 ): Promise<boolean> {
     try {
-        await redis.setEx(key, ttl, JSON.stringify(value));
+        await redis.setEx(key, ttl, payload);
         return true;
     } catch (err) {
         console.error(`Cache set error for key ${key}:`, err);
@@ -37,6 +33,34 @@ export async function setCache(
     }
 }
 
+/**
+ * Get value from Redis cache
+ */
+export async function getCache(redis: any, key: string): Promise<any | null> {
+    const cached = await getCacheRaw(redis, key);
+    if (!cached) {
+        return null;
+    }
+    try {
+        return JSON.parse(cached);
+    } catch (err) {
+        console.error(`Cache get error for key ${key}:`, err);
+        return null;
+    }
+}
+
+/**
+ * Set value in Redis cache with TTL
+ */
+export async function setCache(
+    redis: any,
+    key: string,
+    value: any,
+    ttl: number = 300 // Default 5 minutes
+): Promise<boolean> {
+    return setCacheRaw(redis, key, JSON.stringify(value), ttl);
+}
+
 /**
  * Delete cache by key
  */
@@ -1,4 +1,5 @@
 const EARTH_RADIUS_METERS = 6_371_000;
+const DEG_TO_RAD = Math.PI / 180;
 
 export default function haversineDistance(
     lat1: number,
@@ -6,17 +7,12 @@ export default function haversineDistance(
     lat2: number,
     lon2: number
 ): number {
-    const toRad = (deg: number) => (deg * Math.PI) / 180;
+    const φ1 = lat1 * DEG_TO_RAD;
+    const φ2 = lat2 * DEG_TO_RAD;
+    const sinHalfΔφ = Math.sin((φ2 - φ1) / 2);
+    const sinHalfΔλ = Math.sin((lon2 - lon1) * DEG_TO_RAD / 2);
 
-    const φ1 = toRad(lat1);
-    const φ2 = toRad(lat2);
-    const Δφ = toRad(lat2 - lat1);
-    const Δλ = toRad(lon2 - lon1);
-
-    const a =
-        Math.sin(Δφ / 2) * Math.sin(Δφ / 2) +
-        Math.cos(φ1) * Math.cos(φ2) *
-        Math.sin(Δλ / 2) * Math.sin(Δλ / 2);
+    const a = sinHalfΔφ * sinHalfΔφ + Math.cos(φ1) * Math.cos(φ2) * sinHalfΔλ * sinHalfΔλ;
     const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
 
     return EARTH_RADIUS_METERS * c;
@@ -1,4 +1,8 @@
 export enum PrismaCodeMap {
+    VALUE_TOO_LONG = 'P2000',
     CONFLICT = 'P2002',
+    FOREIGN_KEY_VIOLATION = 'P2003',
+    DATA_VALIDATION = 'P2007',
+    INCONSISTENT_COLUMN_DATA = 'P2023',
     NOT_FOUND = 'P2025'
 }
\ No newline at end of file
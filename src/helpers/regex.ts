@@ -1,7 +1,16 @@
+const BASE64_REGEX = /^[A-Za-z0-9+/=]*$/;
+
 export function isBase64(image: string) {
-    if (!image || typeof image !== 'string' || image.trim().length === 0) {
+    // Images can be hundreds of KB: a single regex pass, no trimmed copy (whitespace fails the regex anyway)
+    if (!image || typeof image !== 'string') {
         return false;
     }
-    const base64Regex = /^[A-Za-z0-9+/=]*$/;
-    return base64Regex.test(image);
-}
\ No newline at end of file
+    return BASE64_REGEX.test(image);
+}
+
+// Canonical hyphenated UUID, the form Postgres' ::uuid cast and the route schemas' format: 'uuid' both accept
+export const UUID_REGEX = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+export function isUuid(value: string) {
+    return UUID_REGEX.test(value);
+}
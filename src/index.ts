@@ -14,7 +14,9 @@ import { MlServices } from './services/ml/index.js';
 import metricsPlugin from './services/metrics.js';
 import prismaPlugin from './services/prisma.js';
 import dataRetentionCron from './services/dataRetentionCron.js';
+import auditPartitionCron from './services/auditPartitionCron.js';
 import { SessionModel } from './model/session.js';
+import { UUID_REGEX } from './helpers/regex.js';
 
 const server = fastify({
     ignoreTrailingSlash: true,
@@ -23,6 +25,11 @@ const server = fastify({
             removeAdditional: false,
             allErrors: true,
             strict: true
+        },
+        // Runs after ajv-formats is added: replaces its uuid format (which also accepts a urn:uuid: prefix that
+        // Postgres' ::uuid rejects) with the pattern isUuid uses, so an id that passes validation always casts
+        onCreate: (ajv: any) => {
+            ajv.addFormat('uuid', UUID_REGEX);
         }
     }
 });
@@ -60,6 +67,7 @@ try {
         .register(errorHandler)
         .register(metricsPlugin)
         .register(dataRetentionCron)
+        .register(auditPartitionCron)
         .register(controller);
 
     server.addHook('onClose', async () => {
@@ -1,7 +1,8 @@
-import { randomUUID } from 'node:crypto';
 import { AppError, BadRequestError } from './error.js';
 import { DeviceModel } from './device.js';
-import type { PrismaClient } from '../generated/prisma/client.js';
+import { isUuid } from '../helpers/regex.js';
+import { PrismaCodeMap } from '../helpers/prismaCodeMap.js';
+import { Prisma, type PrismaClient } from '../generated/prisma/client.js';
 
 export enum AUDIT_ACTIONS {
     LOGIN_SUCCESS = 'login_success',
@@ -26,6 +27,28 @@ export enum AUDIT_ACTIONS {
     DATA_EXPORTED = 'data_exported'
 }
 
+// Audit logs are buffered in memory and written in batches (one INSERT per flush) instead of one round trip per request
+const AUDIT_FLUSH_BATCH_SIZE = 500;
+const AUDIT_FLUSH_INTERVAL_MS = 200;
+const AUDIT_QUEUE_HIGH_WATER_MARK = 5000;
+
+type PendingAuditLog = {
+    row: Prisma.audit_logsCreateManyInput;
+    resolveDeviceForUserId: string | null;
+};
+
+// Prisma errors that a single bad row can cause: value too long, foreign key violation, invalid value, bad UUID
+const AUDIT_ROW_ERROR_CODES: ReadonlySet<string> = new Set([
+    PrismaCodeMap.VALUE_TOO_LONG,
+    PrismaCodeMap.FOREIGN_KEY_VIOLATION,
+    PrismaCodeMap.DATA_VALIDATION,
+    PrismaCodeMap.INCONSISTENT_COLUMN_DATA
+]);
+
+const pendingAuditLogs: PendingAuditLog[] = [];
+let auditFlushTimer: NodeJS.Timeout | null = null;
+let auditFlushChain: Promise<void> = Promise.resolve();
+
 export const AuditModel = {
     getFilteredLogs: async function (prisma: PrismaClient, filters: {
         user_id?: string;
@@ -57,67 +80,57 @@ export const AuditModel = {
             const validLimit = Math.max(1, Math.min(limit, 500));
 
             // Build where clause
-            const where: any = {};
-
-            if (user_id) where.user_id = user_id;
-            if (action) where.action = action;
-            if (resource_type) where.resource_type = resource_type;
-            if (resource_id) where.resource_id = resource_id;
-            if (success !== undefined) where.success = success;
-            if (start_date) where.timestamp = { ...where.timestamp, gte: new Date(start_date) };
-            if (end_date) where.timestamp = { ...where.timestamp, lte: new Date(end_date) };
+            const conditions: Prisma.Sql[] = [];
+
+            if (user_id) conditions.push(Prisma.sql`a.user_id = ${user_id}::uuid`);
+            if (action) conditions.push(Prisma.sql`a.action = ${action}::audit_action`);
+            if (resource_type) conditions.push(Prisma.sql`a.resource_type = ${resource_type}`);
+            if (resource_id) conditions.push(Prisma.sql`a.resource_id = ${resource_id}`);
+            if (success !== undefined) conditions.push(Prisma.sql`a.success = ${success}`);
+            if (start_date) conditions.push(Prisma.sql`a.timestamp >= ${new Date(start_date)}`);
+            if (end_date) conditions.push(Prisma.sql`a.timestamp <= ${new Date(end_date)}`);
             if (search) {
-                where.OR = [
-                    { users: { email: { contains: search, mode: 'insensitive' } } },
-                    { resource_id: { contains: search, mode: 'insensitive' } },
-                    { details: { contains: search, mode: 'insensitive' } }
-                ];
+                const pattern = `%${search.replace(/[\\%_]/g, '\\$&')}%`;
+                // details is JSONB; free-text search matches against its text rendering
+                conditions.push(Prisma.sql`(u.email ILIKE ${pattern} OR a.resource_id ILIKE ${pattern} OR a.details::text ILIKE ${pattern})`);
             }
 
-            const [total, logs] = await prisma.$transaction([
-                prisma.audit_logs.count({ where }),
-                prisma.audit_logs.findMany({
-                    where,
-                    select: {
-                        id: true,
-                        user_id: true,
-                        users: { select: { email: true } },
-                        action: true,
-                        resource_type: true,
-                        resource_id: true,
-                        ip_address: true,
-                        user_agent: true,
-                        device_id: true,
-                        details: true,
-                        success: true,
-                        timestamp: true
-                    },
-                    orderBy: { timestamp: 'desc' },
-                    take: validLimit,
-                    skip: offset
-                })
-            ]);
+            const where = conditions.length ? Prisma.sql`WHERE ${Prisma.join(conditions, ' AND ')}` : Prisma.empty;
+
+            const rows = await prisma.$queryRaw<{
+                id: string;
+                user_id: string | null;
+                user_email: string | null;
+                action: string;
+                resource_type: string | null;
+                resource_id: string | null;
+                ip_address: string | null;
+                user_agent: string | null;
+                device_id: string | null;
+                details: Prisma.JsonValue;
+                success: boolean | null;
+                timestamp: Date;
+                total: number;
+            }[]>`
+                SELECT a.id, a.user_id, u.email AS user_email, a.action, a.resource_type, a.resource_id,
+                       a.ip_address, a.user_agent, a.device_id, a.details, a.success, a.timestamp,
+                       count(*) OVER ()::int AS total
+                FROM audit_logs a
+                LEFT JOIN users u ON u.id = a.user_id
+                ${where}
+                ORDER BY a.timestamp DESC, a.id
+                LIMIT ${validLimit} OFFSET ${offset}
+            `;
 
-            const items = logs.map(row => ({
-                id: row.id,
-                user_id: row.user_id,
-                user_email: row.users?.email,
-                action: row.action,
-                resource_type: row.resource_type,
-                resource_id: row.resource_id,
-                ip_address: row.ip_address,
-                user_agent: row.user_agent,
-                device_id: row.device_id,
-                details: (() => {
-                    try {
-                        return typeof row.details === 'string' ? JSON.parse(row.details) : row.details;
-                    } catch {
-                        return row.details;
-                    }
-                })(),
-                success: row.success,
-                timestamp: row.timestamp
-            }));
+            // An offset past the last row yields no rows (and so no total); count separately in that case only
+            let total = rows[0]?.total ?? 0;
+            if (!rows.length && offset > 0) {
+                const [counted] = await prisma.$queryRaw<{ total: number }[]>`
+                    SELECT count(*)::int AS total FROM audit_logs a LEFT JOIN users u ON u.id = a.user_id ${where}
+                `;
+                total = counted?.total ?? 0;
+            }
+            const items = rows.map(({ total: _total, ...row }) => row);
 
             return { items, total, limit: validLimit, offset };
         } catch (err: any) {
@@ -182,42 +195,125 @@ export const AuditModel = {
             if (resourceId && resourceId.length > 36) {
                 safeDetails.resource_id_full = resourceId;
             }
-            if (deviceId && deviceId.length > 36) {
+            // user_id/device_id are UUID columns: anything that is not a UUID would fail the cast (and with it
+            // the whole batch insert), so it is stored as NULL and kept only in details
+            const uuidOrNull = (value?: string | null) => value && isUuid(value) ? value : null;
+            if (deviceId && !isUuid(deviceId)) {
                 safeDetails.device_id_full = deviceId;
             }
-            if (userId && userId.length > 36) {
+            if (userId && !isUuid(userId)) {
                 safeDetails.user_id_full = userId;
             }
 
-            const safeUserId = trim36(userId);
+            const safeUserId = uuidOrNull(userId);
             const safeResourceId = trim36(resourceId) || 'unknown';
-            let safeDeviceId = trim36(deviceId);
 
-            if (!deviceId && action !== AUDIT_ACTIONS.USER_CREATED && userId) {
-                try {
-                    const device = await DeviceModel.getCurrentActiveDevice(prisma, userId);
-                    safeDeviceId = trim36(device.id);
-                } catch (err) {
-                    console.error(`No device found for user with id ${userId} during audit logging`);
-                }
-            }
-            await prisma.audit_logs.create({
-                data: {
-                    id: randomUUID(),
-                    user_id: safeUserId || null,
+            pendingAuditLogs.push({
+                row: {
+                    user_id: safeUserId,
                     action: action,
                     resource_type: resourceType,
                     resource_id: safeResourceId,
                     ip_address: ipAddress,
                     user_agent: userAgent,
-                    device_id: safeDeviceId || null,
+                    device_id: uuidOrNull(deviceId),
                     success: success,
-                    details: JSON.stringify(safeDetails),
+                    details: safeDetails,
                     timestamp: new Date()
-                }
+                },
+                // Users without an active device (e.g. dashboard-only staff) are logged without a device_id
+                resolveDeviceForUserId: !deviceId && action !== AUDIT_ACTIONS.USER_CREATED ? safeUserId : null
             });
+
+            if (pendingAuditLogs.length >= AUDIT_QUEUE_HIGH_WATER_MARK) {
+                // Back-pressure: the writer is falling behind, make this caller wait for the drain
+                await AuditModel.flush(prisma);
+            } else if (pendingAuditLogs.length >= AUDIT_FLUSH_BATCH_SIZE) {
+                void AuditModel.flush(prisma);
+            } else if (!auditFlushTimer) {
+                auditFlushTimer = setTimeout(() => void AuditModel.flush(prisma), AUDIT_FLUSH_INTERVAL_MS);
+            }
         } catch (error) {
-            console.error('Failed to insert audit log:', error);
+            console.error('Failed to queue audit log:', error);
+        }
+    },
+    // Writes all queued audit logs; flushes are serialized so batches are inserted in order
+    flush: (prisma: PrismaClient): Promise<void> => {
+        if (auditFlushTimer) {
+            clearTimeout(auditFlushTimer);
+            auditFlushTimer = null;
         }
+
+        auditFlushChain = auditFlushChain.then(async () => {
+            while (pendingAuditLogs.length) {
+                const batch = pendingAuditLogs.splice(0, AUDIT_FLUSH_BATCH_SIZE);
+                try {
+                    await writeAuditBatch(prisma, batch);
+                } catch (error) {
+                    console.error(`Dropped ${batch.length} audit logs, the batch could not be written:`, error);
+                }
+            }
+        });
+        return auditFlushChain;
     }
 };
+
+async function writeAuditBatch(prisma: PrismaClient, batch: PendingAuditLog[]) {
+    // One device lookup for the whole batch instead of one per log
+    const userIds = [...new Set(batch.map(entry => entry.resolveDeviceForUserId).filter((id): id is string => !!id))];
+    const deviceIdByUser = await DeviceModel.getCurrentActiveDeviceIdsByUserIds(prisma, userIds);
+
+    const rows = batch.map(({ row, resolveDeviceForUserId }) => ({
+        ...row,
+        device_id: row.device_id ?? (resolveDeviceForUserId ? deviceIdByUser.get(resolveDeviceForUserId) ?? null : null)
+    }));
+
+    const dropped = await insertAuditRows(prisma, rows);
+    if (dropped) {
+        console.error(`Dropped ${dropped} of ${rows.length} audit logs that could not be inserted`);
+    }
+}
+
+// Audit logs are security records, so one bad row (e.g. the user_id of a since-deleted user) must not cost the
+// rest of its batch: a rejected batch is split in halves until the offending rows are isolated.
+// Returns the number of rows that could not be stored at all.
+async function insertAuditRows(prisma: PrismaClient, rows: Prisma.audit_logsCreateManyInput[]): Promise<number> {
+    try {
+        await prisma.audit_logs.createMany({ data: rows });
+        return 0;
+    } catch (error) {
+        // Only errors caused by a particular row are worth splitting on; pool timeouts, missing partitions and the
+        // like would fail every half the same way and multiply the load during the very overload batching absorbs
+        if (!(error instanceof Prisma.PrismaClientKnownRequestError) || !AUDIT_ROW_ERROR_CODES.has(error.code)) throw error;
+
+        if (rows.length > 1) {
+            const middle = Math.ceil(rows.length / 2);
+            return await insertAuditRows(prisma, rows.slice(0, middle)) + await insertAuditRows(prisma, rows.slice(middle));
+        }
+
+        const [row] = rows as [Prisma.audit_logsCreateManyInput];
+        if (row.user_id || row.device_id) {
+            // Keep the record without its references rather than losing it; the ids stay in details
+            try {
+                await prisma.audit_logs.createMany({
+                    data: [{
+                        ...row,
+                        user_id: null,
+                        device_id: null,
+                        details: {
+                            ...(row.details as Prisma.JsonObject),
+                            ...(row.user_id ? { user_id_full: row.user_id } : {}),
+                            ...(row.device_id ? { device_id_full: row.device_id } : {})
+                        }
+                    }]
+                });
+                return 0;
+            } catch {
+                // Fall through and report the row as dropped
+            }
+        }
+
+        console.error('Dropping audit log that could not be inserted:', row, error);
+        return 1;
+    }
+}
@@ -1,8 +1,7 @@
-import { randomUUID } from 'node:crypto';
-import type { PrismaClient } from '../generated/prisma/client.js';
+import type { Prisma, PrismaClient } from '../generated/prisma/client.js';
 import { AppError, BadRequestError, ForbiddenError, NotFoundError, UnauthorizedError } from './error.js';
 import { SESSION_STATUS, SessionModel } from './session.js';
-import { DeviceModel, TRUST_SCORE_TYPES } from './device.js';
+import { DeviceModel } from './device.js';
 import { EnrollmentModel } from './enrollment.js';
 import { PrismaCodeMap } from '../helpers/prismaCodeMap.js';
 import haversineDistance from '../helpers/haversineDistance.js';
@@ -12,7 +11,6 @@ import { USER_ROLE_TYPES, UserModel } from './user.js';
 import { isBase64 } from '../helpers/regex.js';
 import { APPEAL_WINDOW_MS, DEFAULT_GEOFENCE_RADIUS_METERS } from '../helpers/constants.js';
 import { parseQrPayload, secureEqualsHex, signQrPayload } from '../helpers/qr.js';
-import getRiskLevel from '../helpers/getRiskLevels.js';
 import { buildRiskSignals, getSignalSeverity, normalizeRiskFactors, RiskSignalModel, type RiskSignal } from './riskSignals.js';
 import { CourseModel } from './course.js';
 import { detectGeoSpoofing, getGeoSpoofingRiskFactors } from '../helpers/geoSpoofingDetection.js';
@@ -53,6 +51,64 @@ export type Checkin = {
     face_match_passed?: boolean | null;
 };
 
+// Selects are hoisted so every call hands Prisma the same query shape
+const CHECKIN_LIST_SELECT = {
+    id: true,
+    session_id: true,
+    sessions: {
+        select: {
+            name: true,
+            actual_start: true,
+            scheduled_start: true,
+            course_id: true,
+            courses: { select: { code: true } }
+        }
+    },
+    student_id: true,
+    users_checkins_student_idTousers: { select: { full_name: true, email: true } },
+    status: true,
+    checked_in_at: true,
+    latitude: true,
+    longitude: true,
+    distance_from_venue_meters: true,
+    risk_score: true,
+    risk_factors: true,
+    liveness_passed: true,
+    liveness_score: true,
+    face_match_passed: true,
+    face_match_score: true,
+    appealed_at: true,
+    appeal_reason: true,
+    reviewed_by_id: true,
+    reviewed_at: true,
+    review_notes: true
+} satisfies Prisma.checkinsSelect;
+
+const SESSION_CHECKIN_SELECT = {
+    id: true,
+    student_id: true,
+    users_checkins_student_idTousers: { select: { full_name: true, email: true } },
+    status: true,
+    checked_in_at: true,
+    latitude: true,
+    longitude: true,
+    distance_from_venue_meters: true,
+    liveness_passed: true,
+    liveness_score: true,
+    face_match_score: true,
+    risk_score: true,
+    risk_factors: true,
+    devices: { select: { is_trusted: true } }
+} satisfies Prisma.checkinsSelect;
+
+// liveness_score, face_match_score and risk_score are CHECKed to [0, 1]; an out-of-range ML score is clamped
+// instead of aborting the check-in transaction, and a missing or non-numeric one becomes null
+function toUnitScore(score: unknown): number | null {
+    const value = Number(score);
+    if (score == null || !Number.isFinite(value)) return null;
+    return Math.min(1, Math.max(0, value));
+}
+
 export const CheckinModel = {
     create: async (prisma: PrismaClient, studentId: string, payload: {
         ipAddr: string;
@@ -198,7 +254,7 @@ export const CheckinModel = {
 
                 let user;
                 try {
-                    user = await UserModel.getById(tx as any, studentId);
+                    user = await UserModel.getWithFaceTemplateById(tx as any, studentId);
                 } catch (err) {
                     if (err instanceof NotFoundError) {
                         throw new BadRequestError('User not found');
@@ -244,7 +300,7 @@ export const CheckinModel = {
                         throw err;
                     }
                     livenessPassed = Boolean(livenessResult.liveness_passed);
-                    livenessScore = livenessResult.liveness_score;
+                    livenessScore = toUnitScore(livenessResult.liveness_score);
                     faceEmbeddingHash = livenessResult.face_embedding_hash;
                 }
 
@@ -265,7 +321,7 @@ export const CheckinModel = {
                         throw err;
                     }
                     matchPassed = Boolean(faceResult.match_passed);
-                    matchScore = faceResult.match_score;
+                    matchScore = toUnitScore(faceResult.match_score);
                 }
 
                 // 7. GPS Spoofing Detection
@@ -333,6 +389,8 @@ export const CheckinModel = {
                         accuracy: location_accuracy_meters
                     }
                 });
+                // Without a usable risk score the check-in cannot be auto-approved: store the maximum and flag it
+                const riskScore = toUnitScore(risk_score);
                 const signalBreakdown = typeof signal_breakdown === 'object' ? signal_breakdown : JSON.parse(signal_breakdown);
 
                 for (const [key, value] of Object.entries(signalBreakdown)) {
@@ -359,7 +417,7 @@ export const CheckinModel = {
 
                 if ((requireLiveness && !livenessPassed) || (requireFaceMatch && !matchPassed) || diffDist > geofenceRadius * 2) {
                     status = CHECKIN_STATUS.REJECTED;
-                } else if (!Boolean(pass_threshold)) {
+                } else if (riskScore === null || !Boolean(pass_threshold)) {
                     status = CHECKIN_STATUS.FLAGGED;
                 } else {
                     status = CHECKIN_STATUS.APPROVED;
@@ -368,7 +426,6 @@ export const CheckinModel = {
                 try {
                     const checkin = await tx.checkins.create({
                         data: {
-                            id: randomUUID(),
                             session_id: session_id,
                             device_id: device.id,
                             student_id: studentId,
@@ -379,8 +436,8 @@ export const CheckinModel = {
                             distance_from_venue_meters: diffDist,
                             liveness_passed: livenessPassed,
                             liveness_score: livenessScore,
-                            risk_score: risk_score,
-                            risk_factors: JSON.stringify(riskFactors),
+                            risk_score: riskScore ?? 1,
+                            risk_factors: riskFactors,
                             location_accuracy_meters: location_accuracy_meters,
                             liveness_challenge_type: liveness_challenge_type,
                             face_match_passed: matchPassed,
@@ -405,11 +462,9 @@ export const CheckinModel = {
                         }
                     });
 
-                    // 9. Update relevant records after check in
+                    // 9. Persist risk signals (device counters/trust score are updated by the checkins trigger)
                     const persistedRiskSignals = await RiskSignalModel.insertRiskSignals(tx as any, checkin.id, riskSignals);
 
-                    await DeviceModel.updateAfterCheckin(tx as any, device.id, getRiskLevel(risk_score) as TRUST_SCORE_TYPES);
-
                     return {
                         ...checkin,
                         recommendations,
@@ -492,37 +547,7 @@ export const CheckinModel = {
                 prisma.checkins.count({ where }),
                 prisma.checkins.findMany({
                     where,
-                    select: {
-                        id: true,
-                        session_id: true,
-                        sessions: {
-                            select: {
-                                name: true,
-                                actual_start: true,
-                                scheduled_start: true,
-                                course_id: true,
-                                courses: { select: { code: true } }
-                            }
-                        },
-                        student_id: true,
-                        users_checkins_student_idTousers: { select: { full_name: true, email: true } },
-                        status: true,
-                        checked_in_at: true,
-                        latitude: true,
-                        longitude: true,
-                        distance_from_venue_meters: true,
-                        risk_score: true,
-                        risk_factors: true,
-                        liveness_passed: true,
-                        liveness_score: true,
-                        face_match_passed: true,
-                        face_match_score: true,
-                        appealed_at: true,
-                        appeal_reason: true,
-                        reviewed_by_id: true,
-                        reviewed_at: true,
-                        review_notes: true
-                    },
+                    select: CHECKIN_LIST_SELECT,
                     orderBy: { checked_in_at: 'desc' },
                     ...(isFinite(limit) && { take: Math.max(1, Math.min(limit, 200)) }),
                     skip: offset
@@ -720,22 +745,7 @@ export const CheckinModel = {
 
             const checkins = await prisma.checkins.findMany({
                 where,
-                select: {
-                    id: true,
-                    student_id: true,
-                    users_checkins_student_idTousers: { select: { full_name: true, email: true } },
-                    status: true,
-                    checked_in_at: true,
-                    latitude: true,
-                    longitude: true,
-                    distance_from_venue_meters: true,
-                    liveness_passed: true,
-                    liveness_score: true,
-                    face_match_score: true,
-                    risk_score: true,
-                    risk_factors: true,
-                    devices: { select: { is_trusted: true } }
-                },
+                select: SESSION_CHECKIN_SELECT,
                 orderBy: { checked_in_at: 'desc' }
             });
 
@@ -1,4 +1,3 @@
-import { randomUUID } from 'crypto';
 import type { PrismaClient, courses as Course } from '../generated/prisma/client.js';
 import { AppError, BadRequestError, ConflictError, NotFoundError, UnauthorizedError } from "./error.js";
 import { USER_ROLE_TYPES } from "./user.js";
@@ -113,7 +112,6 @@ export const CourseModel = {
         try {
             return await prisma.courses.create({
                 data: {
-                    id: randomUUID(),
                     code: data.code!,
                     name: data.name!,
                     semester: data.semester!,
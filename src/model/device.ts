@@ -3,7 +3,6 @@ import { AppError, BadRequestError, NotFoundError, ForbiddenError, ConflictError
 import { USER_ROLE_TYPES } from './user.js';
 import { PrismaCodeMap } from '../helpers/prismaCodeMap.js';
 import deviceAttestationService from '../services/attestation/index.js';
-import { randomUUID } from 'crypto';
 
 export enum PLATFORM_TYPES {
     IOS = 'ios',
@@ -11,6 +10,7 @@ export enum PLATFORM_TYPES {
     WEB = 'web',
     DESKTOP = 'desktop'
 }
+const PLATFORM_VALUES: ReadonlySet<string> = new Set(Object.values(PLATFORM_TYPES));
 
 export enum TRUST_SCORE_TYPES {
     LOW = 'low',
@@ -58,7 +58,7 @@ export const DeviceModel = {
             : `legacy:${device_fingerprint}`;
 
         // Check if the platform is valid if platform is provided in the payload
-        if (platform && !Object.values(PLATFORM_TYPES).includes(platform as PLATFORM_TYPES)) {
+        if (platform && !PLATFORM_VALUES.has(platform)) {
             throw new BadRequestError("Invalid platform type");
         }
 
@@ -117,7 +117,6 @@ export const DeviceModel = {
                     }) :
                     await tx.devices.create({
                         data: {
-                            id: randomUUID(),
                             user_id: userId,
                             device_fingerprint,
                             device_name: device_name ?? null,
@@ -179,6 +178,30 @@ export const DeviceModel = {
             throw new BadRequestError('Database operation failed');
         }
     },
+    // Batched getCurrentActiveDevice: userId -> id of that user's current active device (users without one are absent)
+    getCurrentActiveDeviceIdsByUserIds: async (prisma: PrismaClient, userIds: string[]): Promise<Map<string, string>> => {
+        const deviceIdByUser = new Map<string, string>();
+        if (!userIds.length) {
+            return deviceIdByUser;
+        }
+
+        const devices = await prisma.devices.findMany({
+            where: {
+                user_id: { in: userIds },
+                is_active: true
+            },
+            orderBy: { last_seen_at: 'desc' },
+            select: { id: true, user_id: true }
+        });
+
+        for (const device of devices) {
+            if (!deviceIdByUser.has(device.user_id)) {
+                deviceIdByUser.set(device.user_id, device.id);
+            }
+        }
+
+        return deviceIdByUser;
+    },
     getAllByUserId: async (prisma: PrismaClient, userId: string, isActiveOnly = false) => {
         try {
             return await prisma.devices.findMany({
@@ -344,24 +367,6 @@ export const DeviceModel = {
             throw new BadRequestError('Database operation failed');
         }
     },
-    updateAfterCheckin: async (prisma: PrismaClient, deviceId: string, trustScore: TRUST_SCORE_TYPES) => {
-        try {
-            await prisma.devices.update({
-                where: { id: deviceId },
-                data: {
-                    total_checkins: { increment: 1 },
-                    last_seen_at: new Date(),
-                    trust_score: trustScore
-                }
-            });
-        } catch (err: any) {
-            if (err?.code === PrismaCodeMap.NOT_FOUND) {
-                throw new NotFoundError("Device not found");
-            }
-            if (err instanceof AppError) throw err;
-            throw new BadRequestError('Database operation failed');
-        }
-    },
     getFiltered: async (prisma: PrismaClient, params: { user_id?: string; is_active?: boolean; limit?: number; offset?: number }) => {
         try {
             const { user_id, is_active, limit = 50, offset = 0 } = params;
@@ -4,7 +4,6 @@ import { AppError, BadRequestError, ForbiddenError, NotFoundError } from "./erro
 import { USER_ROLE_TYPES, UserModel } from "./user.js";
 import { PrismaCodeMap } from '../helpers/prismaCodeMap.js';
 import extractNameFromEmail from "../helpers/extractNameFromEmail.js";
-import { randomUUID } from 'node:crypto';
 
 type EnrollmentActor = {
     id: string;
@@ -202,7 +201,6 @@ export const EnrollmentModel = {
 
             return await prisma.enrollments.create({
                 data: {
-                    id: randomUUID(),
                     student_id: studentId,
                     course_id: courseId,
                     is_active: true,
@@ -317,15 +315,16 @@ export const EnrollmentModel = {
                 // Enroll students
                 let enrolled = 0;
                 if (inactiveEnrollmentRows.length > 0) {
+                    // Reactivate all inactive rows in one statement
+                    await tx.enrollments.updateMany({
+                        where: { id: { in: inactiveEnrollmentRows.map(row => row.id) } },
+                        data: {
+                            is_active: true,
+                            dropped_at: null,
+                            enrolled_at: new Date(),
+                        }
+                    });
                     for (const row of inactiveEnrollmentRows) {
-                        await tx.enrollments.update({
-                            where: { id: row.id },
-                            data: {
-                                is_active: true,
-                                dropped_at: null,
-                                enrolled_at: new Date(),
-                            }
-                        });
                         if (row.users?.email) {
                             setDetail(row.users.email, 'enrolled');
                         }
@@ -338,7 +337,6 @@ export const EnrollmentModel = {
 
                     await tx.enrollments.createMany({
                         data: usersToEnroll.map(u => ({
-                            id: randomUUID(),
                             student_id: u.id,
                             course_id: courseId,
                             is_active: true,
@@ -1,5 +1,4 @@
-import { randomUUID } from 'node:crypto';
-import type { PrismaClient } from '../generated/prisma/client.js';
+import { Prisma, type PrismaClient } from '../generated/prisma/client.js';
 import { AppError, BadRequestError } from './error.js';
 
 export enum RiskSignalSeverity {
@@ -139,12 +138,11 @@ export const RiskSignalModel = {
 
             return await prisma.risk_signals.createManyAndReturn({
                 data: signals.map(signal => ({
-                    id: randomUUID(),
                     checkin_id: checkinId,
                     signal_type: signal.signal_type as any,
                     severity: signal.severity as any,
                     confidence: signal.confidence,
-                    details: signal.details ? JSON.stringify(signal.details) : null,
+                    details: signal.details ?? Prisma.DbNull,
                     weight: signal.weight,
                     detected_at: signal.detected_at
                 }))
@@ -1,4 +1,3 @@
-import { randomUUID } from 'crypto';
 import type { PrismaClient, sessions as Session } from '../generated/prisma/client.js';
 import { NotFoundError, BadRequestError, AppError, ForbiddenError } from './error.js';
 import { USER_ROLE_TYPES } from './user.js';
@@ -504,7 +503,6 @@ export const SessionModel = {
 
             return await prisma.sessions.create({
                 data: {
-                    id: randomUUID(),
                     course_id,
                     instructor_id: resolvedInstructorId,
                     name,
@@ -1,34 +1,39 @@
-import type { PrismaClient } from '../generated/prisma/client.js';
+import { Prisma, type PrismaClient } from '../generated/prisma/client.js';
 import { AppError, BadRequestError, ForbiddenError, NotFoundError } from './error.js';
 import { USER_ROLE_TYPES } from './user.js';
 
-const SGT_OFFSET_MS = 8 * 60 * 60 * 1000;
 const DAY_MS = 24 * 60 * 60 * 1000;
+// Timestamps are stored as UTC; reporting days follow SGT (UTC+8)
+const SGT_OFFSET = Prisma.sql`interval '8 hours'`;
+
+type DailyCheckinRow = {
+    date: string;
+    is_today: boolean;
+    count: number;
+    approved: number;
+    low_risk: number;
+    medium_risk: number;
+    high_risk: number;
+};
 
-function startOfSgtDayUtc(base: Date): Date {
-    const shifted = base.getTime() + SGT_OFFSET_MS;
-    const dayStartShifted = Math.floor(shifted / DAY_MS) * DAY_MS;
-    return new Date(dayStartShifted - SGT_OFFSET_MS);
-}
-
-function addDays(date: Date, days: number): Date {
-    return new Date(date.getTime() + (days * DAY_MS));
-}
-
-function toSgtDateKey(value: Date): string {
-    const shifted = new Date(value.getTime() + SGT_OFFSET_MS);
-    return shifted.toISOString().slice(0, 10);
-}
+type SessionCheckinStatsRow = {
+    approved: number;
+    flagged: number;
+    rejected: number;
+    pending: number;
+    average_risk_score: number | null;
+    average_distance_meters: number | null;
+    low_risk: number;
+    medium_risk: number;
+    high_risk: number;
+};
 
 export const StatsModel = {
     getOverview: async function (prisma: PrismaClient, user: { sub: string; role: USER_ROLE_TYPES }, params: { days?: number; course_id?: string }) {
         try {
             const { days = 7, course_id } = params;
 
-            const now = new Date();
-            const todaySgtStart = startOfSgtDayUtc(now);
-            const sinceSgtStart = addDays(todaySgtStart, -(days - 1));
-            const weekAgo = new Date(now.getTime() - (7 * DAY_MS));
+            const weekAgo = new Date(Date.now() - (7 * DAY_MS));
 
             // Authorization: Instructors can only see their own courses
             if (user.role === USER_ROLE_TYPES.INSTRUCTOR && course_id) {
@@ -47,6 +52,11 @@ export const StatsModel = {
                 if (user.role === USER_ROLE_TYPES.INSTRUCTOR) return { instructor_id: user.sub };
                 return {};
             })();
+            const courseFilter = (() => {
+                if (course_id) return Prisma.sql`AND co.id = ${course_id}::uuid`;
+                if (user.role === USER_ROLE_TYPES.INSTRUCTOR) return Prisma.sql`AND co.instructor_id = ${user.sub}::uuid`;
+                return Prisma.empty;
+            })();
 
             // Run all queries in parallel
             const [
@@ -54,18 +64,15 @@ export const StatsModel = {
                 totalStudents,
                 totalSessions,
                 activeSessions,
-                totalCheckinsToday,
                 totalCheckinsWeek,
-                approvedTodayCount,
                 flaggedCount,
                 approvedCount,
                 rejectedCount,
                 checkinStats,
-                highRiskToday,
                 totalCheckinsAll,
                 allEnrolled,
                 recentCheckins,
-                checkinsInRange,
+                dailyCheckins,
                 sessionsForAttendance,
                 enrollmentsByCourse,
                 checkinsBySession
@@ -95,13 +102,6 @@ export const StatsModel = {
                         courses: { ...courseWhere, is_active: true }
                     }
                 }),
-                // Count checkins today
-                prisma.checkins.count({
-                    where: {
-                        checked_in_at: { gte: todaySgtStart },
-                        sessions: { courses: courseWhere }
-                    }
-                }),
                 // Count checkins this week
                 prisma.checkins.count({
                     where: {
@@ -109,14 +109,6 @@ export const StatsModel = {
                         sessions: { courses: courseWhere }
                     }
                 }),
-                // Count approved checkins today
-                prisma.checkins.count({
-                    where: {
-                        checked_in_at: { gte: todaySgtStart },
-                        status: 'approved',
-                        sessions: { courses: courseWhere }
-                    }
-                }),
                 // Count flagged checkins
                 prisma.checkins.count({
                     where: {
@@ -145,14 +137,6 @@ export const StatsModel = {
                     },
                     _avg: { risk_score: true }
                 }),
-                // Count high risk checkins today
-                prisma.checkins.count({
-                    where: {
-                        checked_in_at: { gte: todaySgtStart },
-                        risk_score: { gte: 0.5 },
-                        sessions: { courses: courseWhere }
-                    }
-                }),
                 // Count total check-ins across all statuses (for approval rate)
                 prisma.checkins.count({
                     where: {
@@ -184,17 +168,34 @@ export const StatsModel = {
                     orderBy: { checked_in_at: 'desc' },
                     take: 20
                 }),
-                // Check-ins in selected range (for daily trend + risk distribution)
-                prisma.checkins.findMany({
-                    where: {
-                        checked_in_at: { gte: sinceSgtStart },
-                        sessions: { courses: courseWhere }
-                    },
-                    select: {
-                        checked_in_at: true,
-                        risk_score: true
-                    }
-                }),
+                // Per-day check-in counts for the selected range (daily trend, today's figures, risk distribution).
+                // Day boundaries come from the database clock so they agree with the stored timestamps.
+                prisma.$queryRaw<DailyCheckinRow[]>`
+                    WITH bounds AS (
+                        SELECT date_trunc('day', timezone('UTC', now()) + ${SGT_OFFSET}) AS today
+                    ),
+                    scoped AS (
+                        SELECT date_trunc('day', c.checked_in_at + ${SGT_OFFSET}) AS day, c.status, c.risk_score
+                        FROM checkins c
+                        JOIN sessions s ON s.id = c.session_id
+                        JOIN courses co ON co.id = s.course_id
+                        CROSS JOIN bounds b
+                        WHERE c.checked_in_at >= b.today - ${SGT_OFFSET} - make_interval(days => ${days - 1}::int)
+                        ${courseFilter}
+                    )
+                    SELECT to_char(d.day, 'YYYY-MM-DD') AS date,
+                           d.day = b.today AS is_today,
+                           count(sc.day)::int AS count,
+                           count(*) FILTER (WHERE sc.status = 'approved')::int AS approved,
+                           count(*) FILTER (WHERE sc.risk_score < 0.3)::int AS low_risk,
+                           count(*) FILTER (WHERE sc.risk_score >= 0.3 AND sc.risk_score < 0.5)::int AS medium_risk,
+                           count(*) FILTER (WHERE sc.risk_score >= 0.5)::int AS high_risk
+                    FROM bounds b
+                    CROSS JOIN generate_series(b.today - make_interval(days => ${days - 1}::int), b.today, interval '1 day') AS d(day)
+                    LEFT JOIN scoped sc ON sc.day = d.day
+                    GROUP BY d.day, b.today
+                    ORDER BY d.day
+                `,
                 // Sessions in scope for attendance-rate calculation
                 prisma.sessions.findMany({
                     where: {
@@ -225,6 +226,10 @@ export const StatsModel = {
                 })
             ]);
 
+            const today = dailyCheckins.find(row => row.is_today);
+            const totalCheckinsToday = today?.count ?? 0;
+            const approvedTodayCount = today?.approved ?? 0;
+            const highRiskToday = today?.high_risk ?? 0;
             const approvalRate = totalCheckinsToday > 0 ? approvedTodayCount / totalCheckinsToday : 0;
             // Attendance is average of per-session attendance rates, capped to 100%.
             // This avoids inflated percentages when multiple sessions exist.
@@ -244,36 +249,14 @@ export const StatsModel = {
                 ? sessionRates.reduce((acc, r) => acc + r, 0) / sessionRates.length
                 : 0;
             const averageRiskScore = checkinStats._avg?.risk_score || 0;
-            const dailyCounts = new Map<string, number>();
             const riskDistribution = { low: 0, medium: 0, high: 0 };
-
-            // Build day buckets with zero defaults for the selected range.
-            for (let i = days - 1; i >= 0; i--) {
-                const d = addDays(todaySgtStart, -i);
-                const key = toSgtDateKey(d);
-                dailyCounts.set(key, 0);
-            }
-
-            for (const item of checkinsInRange) {
-                if (item.checked_in_at) {
-                    const key = toSgtDateKey(new Date(item.checked_in_at));
-                    if (dailyCounts.has(key)) {
-                        dailyCounts.set(key, (dailyCounts.get(key) || 0) + 1);
-                    }
-                }
-
-                const score = Number(item.risk_score ?? 0);
-                if (!Number.isFinite(score)) continue;
-                if (score < 0.3) {
-                    riskDistribution.low += 1;
-                } else if (score < 0.5) {
-                    riskDistribution.medium += 1;
-                } else {
-                    riskDistribution.high += 1;
-                }
+            for (const row of dailyCheckins) {
+                riskDistribution.low += row.low_risk;
+                riskDistribution.medium += row.medium_risk;
+                riskDistribution.high += row.high_risk;
             }
 
-            const checkinsByDay = Array.from(dailyCounts.entries()).map(([date, count]) => ({ date, count }));
+            const checkinsByDay = dailyCheckins.map(({ date, count }) => ({ date, count }));
 
             return {
                 total_courses: totalCourses,
@@ -339,54 +322,31 @@ export const StatsModel = {
                 }
             }
 
-            // Run all queries in parallel
-            const [
-                totalEnrolled,
-                checkedIn,
-                checkinData,
-                byStatus,
-                riskLow,
-                riskMedium,
-                riskHigh
-            ] = await Promise.all([
+            // Every check-in aggregate comes from one pass over the session's check-ins
+            const [totalEnrolled, [checkinStats]] = await Promise.all([
                 prisma.enrollments.count({
                     where: { course_id: session.course_id, is_active: true }
                 }),
-                prisma.checkins.count({
-                    where: { session_id: sessionId, status: 'approved' }
-                }),
-                prisma.checkins.aggregate({
-                    where: { session_id: sessionId },
-                    _avg: {
-                        risk_score: true,
-                        distance_from_venue_meters: true
-                    }
-                }),
-                prisma.checkins.groupBy({
-                    by: ['status'],
-                    where: { session_id: sessionId },
-                    _count: { id: true }
-                }),
-                prisma.checkins.count({
-                    where: { session_id: sessionId, risk_score: { lt: 0.3 } }
-                }),
-                prisma.checkins.count({
-                    where: { session_id: sessionId, risk_score: { gte: 0.3, lt: 0.5 } }
-                }),
-                prisma.checkins.count({
-                    where: { session_id: sessionId, risk_score: { gte: 0.5 } }
-                })
+                prisma.$queryRaw<SessionCheckinStatsRow[]>`
+                    SELECT count(*) FILTER (WHERE status = 'approved')::int AS approved,
+                           count(*) FILTER (WHERE status = 'flagged')::int AS flagged,
+                           count(*) FILTER (WHERE status = 'rejected')::int AS rejected,
+                           count(*) FILTER (WHERE status = 'pending')::int AS pending,
+                           avg(risk_score) AS average_risk_score,
+                           avg(distance_from_venue_meters) AS average_distance_meters,
+                           count(*) FILTER (WHERE risk_score < 0.3)::int AS low_risk,
+                           count(*) FILTER (WHERE risk_score >= 0.3 AND risk_score < 0.5)::int AS medium_risk,
+                           count(*) FILTER (WHERE risk_score >= 0.5)::int AS high_risk
+                    FROM checkins
+                    WHERE session_id = ${sessionId}::uuid
+                `
             ]);
 
-            const statusCounts: any = {};
-            for (const group of byStatus) {
-                statusCounts[group.status] = group._count.id;
-            }
-
+            const checkedIn = checkinStats?.approved ?? 0;
             const riskDistribution = {
-                low: riskLow,
-                medium: riskMedium,
-                high: riskHigh
+                low: checkinStats?.low_risk ?? 0,
+                medium: checkinStats?.medium_risk ?? 0,
+                high: checkinStats?.high_risk ?? 0
             };
 
             const attendanceRate = totalEnrolled > 0 ? checkedIn / totalEnrolled : 0;
@@ -402,15 +362,15 @@ export const StatsModel = {
                 checked_in_count: checkedIn,
                 attendance_rate: attendanceRate,
                 by_status: {
-                    approved: statusCounts.approved || 0,
-                    flagged: statusCounts.flagged || 0,
-                    rejected: statusCounts.rejected || 0,
-                    pending: statusCounts.pending || 0
+                    approved: checkedIn,
+                    flagged: checkinStats?.flagged ?? 0,
+                    rejected: checkinStats?.rejected ?? 0,
+                    pending: checkinStats?.pending ?? 0
                 },
-                approved_count: statusCounts.approved || 0,
-                flagged_count: statusCounts.flagged || 0,
-                average_risk_score: checkinData._avg?.risk_score || 0,
-                average_distance_meters: checkinData._avg?.distance_from_venue_meters || 0,
+                approved_count: checkedIn,
+                flagged_count: checkinStats?.flagged ?? 0,
+                average_risk_score: checkinStats?.average_risk_score || 0,
+                average_distance_meters: checkinStats?.average_distance_meters || 0,
                 risk_distribution: riskDistribution
             };
         } catch (err: any) {
@@ -449,9 +409,8 @@ export const StatsModel = {
                         name: true,
                         status: true,
                         scheduled_start: true,
-                        checkins: {
-                            where: { status: 'approved' },
-                            select: { id: true, student_id: true }
+                        _count: {
+                            select: { checkins: { where: { status: 'approved' } } }
                         }
                     }
                 }),
@@ -465,9 +424,9 @@ export const StatsModel = {
                 name: s.name,
                 status: s.status,
                 date: s.scheduled_start,
-                checked_in: s.checkins.length,
+                checked_in: s._count.checkins,
                 enrolled: totalEnrolled,
-                attendance_rate: totalEnrolled > 0 ? s.checkins.length / totalEnrolled : 0
+                attendance_rate: totalEnrolled > 0 ? s._count.checkins / totalEnrolled : 0
             }));
 
             const totalSessions = sessions.length;
@@ -476,8 +435,8 @@ export const StatsModel = {
                 ? sessionsData.reduce((acc, s) => acc + s.attendance_rate, 0) / totalSessions
                 : 0;
 
-            // Fetch enrollments and flagged checkins in parallel
-            const [enrollmentsList, flaggedCheckins] = await Promise.all([
+            // Fetch enrollments, flagged checkins and per-student approved checkin aggregates in parallel
+            const [enrollmentsList, flaggedCheckins, attendanceByStudent] = await Promise.all([
                 prisma.enrollments.findMany({
                     where: { course_id: courseId, is_active: true },
                     select: {
@@ -490,35 +449,35 @@ export const StatsModel = {
                         status: { in: ['flagged', 'appealed'] },
                         sessions: { course_id: courseId }
                     }
+                }),
+                // Aggregated in the database so memory scales with students, not checkins
+                prisma.checkins.groupBy({
+                    by: ['student_id'],
+                    where: {
+                        sessions: { course_id: courseId },
+                        status: 'approved'
+                    },
+                    _count: { _all: true },
+                    _avg: { risk_score: true }
                 })
             ]);
 
+            const attendanceMap = new Map(attendanceByStudent.map(a => [a.student_id, a]));
+
             // Student attendance
-            const studentAttendance = await Promise.all(
-                enrollmentsList.map(async (e) => {
-                    const attendedSessions = await prisma.checkins.findMany({
-                        where: {
-                            student_id: e.student_id,
-                            sessions: { course_id: courseId },
-                            status: 'approved'
-                        },
-                        select: { session_id: true, risk_score: true }
-                    });
-
-                    const distinctSessions = new Set(attendedSessions.map(c => c.session_id)).size;
-                    const avgRisk = attendedSessions.length > 0
-                        ? attendedSessions.reduce((acc, c) => acc + (c.risk_score || 0), 0) / attendedSessions.length
-                        : 0;
-
-                    return {
-                        student_id: e.student_id,
-                        student_name: e.users?.full_name,
-                        sessions_attended: distinctSessions,
-                        attendance_rate: totalSessions > 0 ? distinctSessions / totalSessions : 0,
-                        average_risk_score: avgRisk
-                    };
-                })
-            );
+            const studentAttendance = enrollmentsList.map(e => {
+                const attendance = attendanceMap.get(e.student_id);
+                // checkins are unique per (session_id, student_id), so the row count is the distinct session count
+                const distinctSessions = attendance?._count._all ?? 0;
+
+                return {
+                    student_id: e.student_id,
+                    student_name: e.users?.full_name,
+                    sessions_attended: distinctSessions,
+                    attendance_rate: totalSessions > 0 ? distinctSessions / totalSessions : 0,
+                    average_risk_score: attendance?._avg.risk_score ?? 0
+                };
+            });
 
             const lowAttendanceAlerts = studentAttendance
                 .filter(s => s.attendance_rate < 0.75)
@@ -566,46 +525,45 @@ export const StatsModel = {
                 throw new ForbiddenError();
             }
 
-            // Fetch enrollments
-            let enrollments: Array<{ course_id: string; courses: { code: string } | null }>;
-            enrollments = await prisma.enrollments.findMany({
-                where: { student_id: studentId, is_active: true },
-                select: {
-                    course_id: true,
-                    courses: { select: { code: true } }
-                }
-            });
-
-            const courses = await Promise.all(
-                enrollments.map(async (e: { course_id: string; courses: { code: string } | null }) => {
-                    const totalSessions = await prisma.sessions.count({
-                        where: { course_id: e.course_id }
-                    });
-
-                    const attended = await prisma.checkins.findMany({
-                        where: {
-                            student_id: studentId,
-                            sessions: { course_id: e.course_id },
-                            status: 'approved'
-                        },
-                        select: { session_id: true, risk_score: true }
-                    });
-
-                    const distinctSessions = new Set(attended.map(c => c.session_id)).size;
-                    const avgRisk = attended.length > 0
-                        ? attended.reduce((acc, c) => acc + (c.risk_score || 0), 0) / attended.length
-                        : 0;
-
-                    return {
-                        course_id: e.course_id,
-                        course_code: e.courses?.code,
-                        attendance_rate: totalSessions > 0 ? distinctSessions / totalSessions : 0,
-                        sessions_attended: distinctSessions,
-                        total_sessions: totalSessions,
-                        average_risk_score: avgRisk
-                    };
+            // Fetch enrollments (with session totals) and all approved checkins in two queries instead of two per course
+            const [enrollments, attended] = await Promise.all([
+                prisma.enrollments.findMany({
+                    where: { student_id: studentId, is_active: true },
+                    select: {
+                        course_id: true,
+                        courses: { select: { code: true, _count: { select: { sessions: true } } } }
+                    }
+                }),
+                prisma.checkins.findMany({
+                    where: { student_id: studentId, status: 'approved' },
+                    select: { risk_score: true, sessions: { select: { course_id: true } } }
                 })
-            );
+            ]);
+
+            // checkins are unique per (session_id, student_id), so each row is a distinct attended session
+            const attendedByCourse = new Map<string, { count: number; riskSum: number }>();
+            for (const c of attended) {
+                const courseId = c.sessions.course_id;
+                const acc = attendedByCourse.get(courseId) || { count: 0, riskSum: 0 };
+                acc.count += 1;
+                acc.riskSum += c.risk_score || 0;
+                attendedByCourse.set(courseId, acc);
+            }
+
+            const courses = enrollments.map(e => {
+                const totalSessions = e.courses?._count.sessions ?? 0;
+                const attendance = attendedByCourse.get(e.course_id);
+                const distinctSessions = attendance?.count ?? 0;
+
+                return {
+                    course_id: e.course_id,
+                    course_code: e.courses?.code,
+                    attendance_rate: totalSessions > 0 ? distinctSessions / totalSessions : 0,
+                    sessions_attended: distinctSessions,
+                    total_sessions: totalSessions,
+                    average_risk_score: distinctSessions > 0 ? attendance!.riskSum / distinctSessions : 0
+                };
+            });
 
             const recentCheckins = await prisma.checkins.findMany({
                 where: { student_id: studentId },
@@ -1,6 +1,5 @@
-import { randomUUID } from 'crypto';
 import * as bcrypt from 'bcrypt';
-import type { PrismaClient, users as User } from '../generated/prisma/client.js';
+import { Prisma, type PrismaClient, type users as User } from '../generated/prisma/client.js';
 import { isBase64 } from '../helpers/regex.js';
 import { BadRequestError, AppError, ForbiddenError, NotFoundError, UnauthorizedError, UnavailableError } from './error.js';
 import { MlServices } from '../services/ml/index.js';
@@ -13,6 +12,7 @@ export enum USER_ROLE_TYPES {
     INSTRUCTOR = 'instructor',
     TA = 'ta'
 }
+const USER_ROLE_VALUES: ReadonlySet<string> = new Set(Object.values(USER_ROLE_TYPES));
 export const USER_ROLE_HIERARCHY: Record<USER_ROLE_TYPES, number> = {
     [USER_ROLE_TYPES.STUDENT]: 1,
     [USER_ROLE_TYPES.TA]: 2,
@@ -20,7 +20,23 @@ export const USER_ROLE_HIERARCHY: Record<USER_ROLE_TYPES, number> = {
     [USER_ROLE_TYPES.ADMIN]: 4
 };
 
+// Profile columns a user is returned with; credentials and the face template hash are never part of it
+const USER_PROFILE_SELECT = {
+    id: true,
+    email: true,
+    full_name: true,
+    role: true,
+    is_active: true,
+    created_at: true,
+    last_login_at: true,
+    camera_consent: true,
+    geolocation_consent: true,
+    face_enrolled: true
+} satisfies Prisma.usersSelect;
+
 const SALT_ROUNDS = parseInt(process.env.SALT_ROUNDS!! || '10');
+// libuv's threadpool has 4 threads by default
+const BCRYPT_HASH_CONCURRENCY = 4;
 
 export const UserModel = {
     getByEmail: async function getByEmail(prisma: PrismaClient, email: string) {
@@ -31,18 +47,7 @@ export const UserModel = {
 
             return await prisma.users.findUniqueOrThrow({
                 where: { email },
-                select: {
-                    id: true,
-                    email: true,
-                    full_name: true,
-                    role: true,
-                    is_active: true,
-                    created_at: true,
-                    last_login_at: true,
-                    camera_consent: true,
-                    geolocation_consent: true,
-                    face_enrolled: true
-                }
+                select: USER_PROFILE_SELECT
             });
         } catch (err: any) {
             if (err?.code === PrismaCodeMap.NOT_FOUND) {
@@ -76,46 +81,44 @@ export const UserModel = {
             const { role, is_active, limit = 50, offset = 0, search } = filters;
 
             // Build dynamic where clause
-            const where: any = {};
+            const conditions: Prisma.Sql[] = [];
 
             if (role) {
-                if (!Object.values(USER_ROLE_TYPES).includes(role.toLowerCase() as USER_ROLE_TYPES)) {
+                if (!USER_ROLE_VALUES.has(role.toLowerCase())) {
                     throw new BadRequestError("Invalid role filter");
                 }
-                where.role = role.toLowerCase();
+                conditions.push(Prisma.sql`role = ${role.toLowerCase()}::user_role`);
             }
 
             if (is_active !== undefined) {
-                where.is_active = is_active;
+                conditions.push(Prisma.sql`is_active = ${is_active}`);
             }
 
             if (search) {
-                where.OR = [
-                    { email: { contains: search, mode: 'insensitive' } },
-                    { full_name: { contains: search, mode: 'insensitive' } }
-                ];
-            }
-
-            const [items, total] = await prisma.$transaction([
-                prisma.users.findMany({
-                    where,
-                    select: {
-                        id: true,
-                        email: true,
-                        full_name: true,
-                        role: true,
-                        is_active: true,
-                        created_at: true,
-                        last_login_at: true,
-                        camera_consent: true,
-                        geolocation_consent: true,
-                        face_enrolled: true
-                    },
-                    skip: offset,
-                    take: limit
-                }),
-                prisma.users.count({ where })
-            ]);
+                const pattern = `%${search.replace(/[\\%_]/g, '\\$&')}%`;
+                conditions.push(Prisma.sql`(email ILIKE ${pattern} OR full_name ILIKE ${pattern})`);
+            }
+
+            const where = conditions.length ? Prisma.sql`WHERE ${Prisma.join(conditions, ' AND ')}` : Prisma.empty;
+
+            // Page and total come back in one statement so the filter is only evaluated once
+            const rows = await prisma.$queryRaw<(Pick<User, 'id' | 'email' | 'full_name' | 'role' | 'is_active' | 'created_at' | 'last_login_at' | 'camera_consent' | 'geolocation_consent' | 'face_enrolled'> & { total: number })[]>`
+                SELECT id, email, full_name, role, is_active, created_at, last_login_at,
+                       camera_consent, geolocation_consent, face_enrolled,
+                       count(*) OVER ()::int AS total
+                FROM users
+                ${where}
+                ORDER BY created_at DESC, id
+                LIMIT ${limit} OFFSET ${offset}
+            `;
+
+            // An offset past the last row yields no rows (and so no total); count separately in that case only
+            let total = rows[0]?.total ?? 0;
+            if (!rows.length && offset > 0) {
+                const [counted] = await prisma.$queryRaw<{ total: number }[]>`SELECT count(*)::int AS total FROM users ${where}`;
+                total = counted?.total ?? 0;
+            }
+            const items = rows.map(({ total: _total, ...user }) => user);
 
             return {
                 items,
@@ -136,19 +139,28 @@ export const UserModel = {
 
             const user = await prisma.users.findUniqueOrThrow({
                 where: { id },
-                select: {
-                    id: true,
-                    email: true,
-                    full_name: true,
-                    role: true,
-                    is_active: true,
-                    created_at: true,
-                    last_login_at: true,
-                    camera_consent: true,
-                    geolocation_consent: true,
-                    face_enrolled: true,
-                    face_embedding_hash: true
-                }
+                select: USER_PROFILE_SELECT
+            });
+
+            return user as User;
+        } catch (err: any) {
+            if (err?.code === PrismaCodeMap.NOT_FOUND) {
+                throw new NotFoundError();
+            }
+            if (err instanceof AppError) throw err;
+            throw new BadRequestError('Database operation failed');
+        }
+    },
+    // Only for the check-in face match: the stored face template hash never leaves the model otherwise
+    getWithFaceTemplateById: async function getWithFaceTemplateById(prisma: PrismaClient, id: string) {
+        try {
+            if (!id) {
+                throw new NotFoundError();
+            }
+
+            const user = await prisma.users.findUniqueOrThrow({
+                where: { id },
+                select: { ...USER_PROFILE_SELECT, face_embedding_hash: true }
             });
 
             return user as User;
@@ -174,18 +186,7 @@ export const UserModel = {
                         }
                     }
                 },
-                select: {
-                    id: true,
-                    email: true,
-                    full_name: true,
-                    role: true,
-                    is_active: true,
-                    created_at: true,
-                    last_login_at: true,
-                    camera_consent: true,
-                    geolocation_consent: true,
-                    face_enrolled: true
-                }
+                select: USER_PROFILE_SELECT
             });
         } catch (err: any) {
             if (err?.code === PrismaCodeMap.NOT_FOUND) {
@@ -200,13 +201,11 @@ export const UserModel = {
             const { email, password, role } = payload;
             const full_name = String(payload.full_name || '').replace(/<[^>]*>/g, '').trim();
 
-            // Hash password
-            const salt = bcrypt.genSaltSync(SALT_ROUNDS);
-            const hashed_password = bcrypt.hashSync(password, salt);
+            // Hash password (async: runs on the libuv threadpool instead of blocking the event loop)
+            const hashed_password = await bcrypt.hash(password, SALT_ROUNDS);
 
             return await prisma.users.create({
                 data: {
-                    id: randomUUID(),
                     email: email!,
                     full_name: full_name!,
                     hashed_password,
@@ -241,12 +240,21 @@ export const UserModel = {
                 return [];
             }
 
+            // Placeholder passwords are hashed on the threadpool a few at a time, so a 500-user import leaves room
+            // between chunks for other requests' pool work (login checks, fs, dns)
+            const hashedPasswords: string[] = [];
+            for (let i = 0; i < users.length; i += BCRYPT_HASH_CONCURRENCY) {
+                hashedPasswords.push(...await Promise.all(
+                    users.slice(i, i + BCRYPT_HASH_CONCURRENCY)
+                        .map(u => u.hashed_password ? u.hashed_password : bcrypt.hash(generateRandomPassword(), SALT_ROUNDS))
+                ));
+            }
+
             return await prisma.users.createManyAndReturn({
-                data: users.map(u => ({
-                    id: randomUUID(),
+                data: users.map((u, i) => ({
                     email: u.email!,
                     full_name: u.full_name!,
-                    hashed_password: u.hashed_password ? u.hashed_password : bcrypt.hashSync(generateRandomPassword(), bcrypt.genSaltSync(SALT_ROUNDS)),
+                    hashed_password: hashedPasswords[i]!,
                     role: u.role ? u.role!.toLowerCase() as USER_ROLE_TYPES : USER_ROLE_TYPES.STUDENT,
                     is_active: true,
                     created_at: new Date(),
@@ -337,18 +345,7 @@ export const UserModel = {
                     ...(payload.geolocation_consent !== undefined && { geolocation_consent: payload.geolocation_consent }),
                     ...(full_name !== undefined && { full_name })
                 },
-                select: {
-                    id: true,
-                    email: true,
-                    full_name: true,
-                    role: true,
-                    is_active: true,
-                    created_at: true,
-                    last_login_at: true,
-                    camera_consent: true,
-                    geolocation_consent: true,
-                    face_enrolled: true
-                }
+                select: USER_PROFILE_SELECT
             });
         } catch (err: any) {
             if (err?.code === PrismaCodeMap.NOT_FOUND) {
@@ -374,8 +371,7 @@ export const UserModel = {
                 throw new BadRequestError('New password must be different from your current password');
             }
 
-            const salt = bcrypt.genSaltSync(SALT_ROUNDS);
-            const hashed_password = bcrypt.hashSync(nextPassword, salt);
+            const hashed_password = await bcrypt.hash(nextPassword, SALT_ROUNDS);
 
             await prisma.users.update({
                 where: { id: userId },
@@ -405,18 +401,7 @@ export const UserModel = {
                     ...(payload.role !== undefined && { role: payload.role.toLowerCase() as any }),
                     updated_at: new Date()
                 },
-                select: {
-                    id: true,
-                    email: true,
-                    full_name: true,
-                    role: true,
-                    is_active: true,
-                    created_at: true,
-                    last_login_at: true,
-                    camera_consent: true,
-                    geolocation_consent: true,
-                    face_enrolled: true
-                }
+                select: USER_PROFILE_SELECT
             });
         } catch (err: any) {
             if (err instanceof AppError) throw err;
@@ -429,15 +414,16 @@ export const UserModel = {
                 throw new NotFoundError();
             }
 
+            // Reject a bad payload before spending a round trip on the consent lookup
+            if (!isBase64(image)) {
+                throw new BadRequestError('Invalid image data');
+            }
+
             const user = await UserModel.getById(prisma, userId);
             if (!user.camera_consent) {
                 throw new BadRequestError('Camera consent required before face enrollment');
             }
 
-            if (!isBase64(image)) {
-                throw new BadRequestError('Invalid image data');
-            }
-
             let mlFaceEnrollResponse;
             try {
                 mlFaceEnrollResponse = await MlServices.face.enroll.post({
@@ -0,0 +1,70 @@
+// Response schemas let Fastify serialize with a precompiled fast-json-stringify function; only listed fields are emitted
+const userResponseProperties = {
+    id: { type: "string" },
+    email: { type: "string" },
+    full_name: { type: "string" },
+    role: { type: "string" },
+    camera_consent: { type: ["boolean", "null"] },
+    geolocation_consent: { type: ["boolean", "null"] },
+    face_enrolled: { type: ["boolean", "null"] },
+    created_at: { type: "string", format: "date-time" }
+};
+export const USER_RESPONSE_SCHEMA = {
+    type: "object",
+    properties: userResponseProperties
+};
+export const USER_DETAIL_RESPONSE_SCHEMA = {
+    type: "object",
+    properties: {
+        ...userResponseProperties,
+        is_active: { type: "boolean" }
+    }
+};
+// Account view used by login/refresh and the admin user listing
+const USER_ACCOUNT_SCHEMA = {
+    type: "object",
+    properties: {
+        ...USER_DETAIL_RESPONSE_SCHEMA.properties,
+        last_login_at: { type: ["string", "null"], format: "date-time" }
+    }
+};
+
+// Login and refresh hand back the tokens plus the signed-in user
+export const TOKEN_RESPONSE_SCHEMA = {
+    type: "object",
+    properties: {
+        access_token: { type: "string" },
+        refresh_token: { type: "string" },
+        token_type: { type: "string" },
+        user: USER_ACCOUNT_SCHEMA
+    }
+};
+
+export const USER_LIST_RESPONSE_SCHEMA = {
+    type: "object",
+    properties: {
+        items: { type: "array", items: USER_ACCOUNT_SCHEMA },
+        total: { type: "integer" },
+        limit: { type: "integer" },
+        offset: { type: "integer" }
+    }
+};
+
+export const BULK_USER_CREATE_RESPONSE_SCHEMA = {
+    type: "object",
+    properties: {
+        users: { type: "array", items: USER_DETAIL_RESPONSE_SCHEMA },
+        created: { type: "integer" },
+        failed: { type: "integer" },
+        error: {
+            type: "array",
+            items: {
+                type: "object",
+                properties: {
+                    email: { type: "string" },
+                    reason: { type: "string" }
+                }
+            }
+        }
+    }
+};
@@ -0,0 +1,37 @@
+import fp from 'fastify-plugin';
+import type { FastifyInstance } from 'fastify';
+import { CronJob } from 'cron';
+
+async function auditPartitionCronPlugin(fastify: FastifyInstance) {
+    // audit_logs is range-partitioned by month; make sure this month's and next month's partitions exist
+    // well before rows for them arrive (otherwise they land in audit_logs_default)
+    async function ensureAuditPartitions() {
+        const prisma = fastify.prisma;
+        await prisma.$executeRaw`SELECT create_audit_logs_partition(timezone('UTC', now())::DATE)`;
+        await prisma.$executeRaw`SELECT create_audit_logs_partition((timezone('UTC', now()) + INTERVAL '1 month')::DATE)`;
+    }
+
+    // A server that was down over a month boundary would otherwise keep writing into audit_logs_default until the
+    // next cron run
+    try {
+        await ensureAuditPartitions();
+    } catch (err) {
+        console.error('Audit partition startup check error:', err);
+    }
+
+    // Schedule the cron job to run daily at 1:00 AM UTC
+    // Format: minute hour day month day-of-week
+    const job = new CronJob('0 1 * * *', async () => {
+        try {
+            await ensureAuditPartitions();
+        } catch (err) {
+            console.error('Audit partition cron job error:', err);
+        }
+    }, null, true, 'UTC');
+
+    fastify.addHook('onClose', async () => {
+        job.stop();
+    });
+}
+
+export default fp(auditPartitionCronPlugin);
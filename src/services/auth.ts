@@ -20,14 +20,17 @@ function auth(fastify: FastifyInstance) {
         cookie: {
             cookieName: 'access_token',
             signed: false
-        }
+        },
+        // Pin the algorithm and cache verified tokens so repeat requests skip the HMAC check
+        sign: { algorithm: 'HS256' },
+        verify: { algorithms: ['HS256'], cache: true }
     })
 
     // Usage: { preHandler: [authorize([USER_ROLE_TYPES.STUDENT, USER_ROLE_TYPES.TA])]}
     // Usage: { preHandler: [authorize(2)]}
     fastify.decorate("authorize", (arg: USER_ROLE_TYPES[] | number = 1) =>
         async function (request: FastifyRequest, _reply: FastifyReply) {
-            const prisma = await fastify.prisma;
+            const prisma = fastify.prisma;
             try {
                 await request.jwtVerify();
             } catch (_err: any) {
@@ -3,8 +3,11 @@ import fastifyCors from '@fastify/cors';
 import type { FastifyInstance } from 'fastify';
 
 function cors(fastify: FastifyInstance) {
+    // Exact-match lookup per request instead of scanning the origin list
+    const allowedOrigins = new Set<string>([fastify.config.FRONTEND_URL, fastify.config.DASHBOARD_URL].filter(Boolean));
+
     fastify.register(fastifyCors, {
-        origin: [fastify.config.FRONTEND_URL, fastify.config.DASHBOARD_URL].filter(Boolean),
+        origin: (origin, cb) => cb(null, origin !== undefined && allowedOrigins.has(origin)),
         credentials: true,
         methods: ['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'],
         allowedHeaders: ['Content-Type', 'Authorization']
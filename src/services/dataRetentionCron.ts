@@ -1,6 +1,5 @@
 import fp from 'fastify-plugin';
 import type { FastifyInstance } from 'fastify';
-import { randomUUID } from 'node:crypto';
 import { CronJob } from 'cron';
 
 async function dataRetentionCronPlugin(fastify: FastifyInstance) {
@@ -36,7 +35,6 @@ async function dataRetentionCronPlugin(fastify: FastifyInstance) {
             // 3. Log the cleanup action (for audit trail)
             await prisma.audit_logs.create({
                 data: {
-                    id: randomUUID(),
                     user_id: null, // System action
                     action: 'data_exported', // Use data_exported as closest match for system cleanup
                     resource_type: 'retention_cleanup',
@@ -44,11 +42,11 @@ async function dataRetentionCronPlugin(fastify: FastifyInstance) {
                     ip_address: null,
                     user_agent: 'system',
                     device_id: null,
-                    details: JSON.stringify({
+                    details: {
                         checkins_deleted: checkinsDeleted.count,
                         users_deleted: usersDeleted.count,
                         timestamp: now.toISOString()
-                    }),
+                    },
                     success: true,
                     timestamp: now
                 }
@@ -69,7 +67,6 @@ async function dataRetentionCronPlugin(fastify: FastifyInstance) {
             try {
                 await prisma.audit_logs.create({
                     data: {
-                        id: randomUUID(),
                         user_id: null,
                         action: 'security_violation',
                         resource_type: 'retention_cleanup',
@@ -77,10 +74,10 @@ async function dataRetentionCronPlugin(fastify: FastifyInstance) {
                         ip_address: null,
                         user_agent: 'system',
                         device_id: null,
-                        details: JSON.stringify({
+                        details: {
                             error: String(error),
                             timestamp: now.toISOString()
-                        }),
+                        },
                         success: false,
                         timestamp: now
                     }
@@ -94,7 +91,7 @@ async function dataRetentionCronPlugin(fastify: FastifyInstance) {
     }
 
     // Schedule the cron job to run daily at 2:00 AM UTC
-    // Format: second minute hour day month day-of-week
+    // Format: minute hour day month day-of-week
     const job = new CronJob('0 2 * * *', async () => {
         try {
             await performDataRetention();
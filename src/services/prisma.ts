@@ -2,6 +2,7 @@ import fp from 'fastify-plugin';
 import { type FastifyPluginAsync } from 'fastify';
 import { PrismaClient } from '../generated/prisma/client.js';
 import { PrismaPg } from '@prisma/adapter-pg';
+import { AuditModel } from '../model/audit.js';
 
 declare module 'fastify' {
     interface FastifyInstance {
@@ -20,6 +21,8 @@ const prismaPlugin: FastifyPluginAsync = fp(async (server, options) => {
     server.decorate('prisma', prisma)
 
     server.addHook('onClose', async (server) => {
+        // Write out buffered audit logs before the pool goes away
+        await AuditModel.flush(server.prisma)
         await server.prisma.$disconnect()
     })
 })